@@ -0,0 +1,5 @@
+"""Headless benchmarks. Run from the repository root, e.g.
+
+    python -m benchmarks                      # the full suite, see suite.py
+    python -m benchmarks.bench_simulation     # a single focused benchmark
+"""
@@ -0,0 +1,72 @@
+"""Report broad-phase pruning and narrow-phase cost for both entity stores.
+
+``Game (brute)`` skips the broad phase and runs the narrow phase on every
+entity, as the baseline the grid has to beat.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from benchmarks.bench_entity_store import populate
+from dodge_blocks.collision import BroadPhase
+from dodge_blocks.constants import DIFFICULTY_SETTINGS
+from dodge_blocks.entity_store import ArrayGame
+from dodge_blocks.simulation import Game
+
+
+class BruteForce(BroadPhase):
+    """Passes every entity to the narrow phase"""
+
+    def near(self, entities, x, y, w, h):
+        self.stats.record(len(entities), len(entities))
+        return set(entities)
+
+
+def pruning_in_play(difficulty, ticks, seed=0):
+    random.seed(seed)
+    policy = random.Random(seed + 1)
+    game = Game(difficulty, seed=seed)
+    for _ in range(ticks):
+        if game.game_over:
+            game.reset()
+        move = policy.random()
+        game.tick(left=move < 0.35, right=move > 0.65)
+    return game.collision_stats
+
+
+def pruning_under_load(game_cls, count, ticks, brute=False):
+    game = game_cls("Pro")
+    if brute:
+        game.broad_phase = BruteForce()
+    populate(game, count, np.random.default_rng(0))
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.update()
+        game.game_over = False
+    elapsed = (time.perf_counter() - start) / ticks
+    return game.collision_stats, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=20000)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    for difficulty in DIFFICULTY_SETTINGS:
+        stats = pruning_in_play(difficulty, args.ticks)
+        print(f"{difficulty:>12}: {stats.total_pruned / stats.ticks:.2f} pairs pruned/tick, "
+              f"{stats.total_candidates / stats.ticks:.2f} narrow-phase tests/tick")
+
+    for count in args.counts:
+        for name, game_cls, brute in (("Game (brute)", Game, True), ("Game", Game, False),
+                                      ("ArrayGame", ArrayGame, False)):
+            stats, elapsed = pruning_under_load(game_cls, count, 20, brute)
+            print(f"{name:>12} {count:>6} entities: {stats.total_pruned / stats.ticks:,.0f} pruned/tick, "
+                  f"{stats.total_candidates / stats.ticks:,.1f} tested/tick, {elapsed * 1000:.3f} ms/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare the object and NumPy entity stores for correctness and throughput.
+
+The parity check plays both stores with the same random seed and input and
+requires identical scores and game-over ticks. The stress test times one
+``update`` with tens of thousands of live entities against the 60 FPS budget.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from dodge_blocks.constants import DIFFICULTY_SETTINGS, OBSTACLE_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH
+from dodge_blocks.entity_store import ArrayGame
+from dodge_blocks.simulation import Game, Obstacle
+
+FRAME_BUDGET = 1 / 60
+
+
+def play(game_cls, difficulty, seed, max_ticks):
+    policy = random.Random(seed + 1)
+    game = game_cls(difficulty, high_score=seed % 7, seed=seed)
+    for tick in range(max_ticks):
+        move = policy.random()
+        game.tick(left=move < 0.35, right=move > 0.65)
+        if game.game_over:
+            return tick, game.score, game.high_score
+    return None, game.score, game.high_score
+
+
+def check_parity(seeds, max_ticks):
+    for difficulty in DIFFICULTY_SETTINGS:
+        for seed in range(seeds):
+            expected = play(Game, difficulty, seed, max_ticks)
+            actual = play(ArrayGame, difficulty, seed, max_ticks)
+            if expected != actual:
+                raise SystemExit(f"{difficulty} seed {seed}: objects {expected} != arrays {actual}")
+    print(f"parity: {seeds * len(DIFFICULTY_SETTINGS)} games identical")
+
+
+def populate(game, count, rng):
+    xs = rng.integers(0, SCREEN_WIDTH - OBSTACLE_SIZE, count)
+    ys = rng.integers(-OBSTACLE_SIZE, SCREEN_HEIGHT, count)
+    if isinstance(game, ArrayGame):
+        game.obstacle_store.extend(xs, ys, np.ones(count, dtype=np.int32))
+    else:
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            obstacle = Obstacle(x, 1)
+            obstacle.y = y
+            game.obstacles.append(obstacle)
+
+
+def time_updates(game_cls, count, ticks):
+    game = game_cls("Intermediate")
+    populate(game, count, np.random.default_rng(0))
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.update()
+        # Keep ticking through collisions so every update does the full work
+        game.game_over = False
+    return (time.perf_counter() - start) / ticks, len(game.obstacles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    check_parity(args.seeds, args.max_ticks)
+    for count in args.counts:
+        for game_cls in (Game, ArrayGame):
+            per_tick, live = time_updates(game_cls, count, args.ticks)
+            print(f"{game_cls.__name__:>9} {count:>6} entities: {per_tick * 1000:8.3f} ms/tick "
+                  f"({per_tick / FRAME_BUDGET:6.1%} of a 60 FPS frame, {live} live at end)")
+
+
+if __name__ == "__main__":
+    main()
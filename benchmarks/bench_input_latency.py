@@ -0,0 +1,103 @@
+"""Measure event-to-present input latency in each render mode.
+
+A helper thread posts movement key events into the SDL queue while a copy of
+the main loop plays a game. The events are a mix of holds and taps shorter
+than a tick. The loop uses ``InputTimeline`` and its ``LatencyTracker`` as
+``main`` does, so every change is timed from arrival to the present of the
+first frame that shows it.
+
+Each backend and render combination runs with the ``polled`` mode, which
+samples one state per frame as before, and with the ``events`` mode. The
+report gives press and release latency percentiles, and how many taps
+were dropped, i.e. never shown on screen. In ``events`` mode a tap's release
+can only show in the tick after the one the tap moved the player in. Those
+taps are the ones ``polled`` mode drops, so their releases are reported on
+their own and the release columns compare the same kind of input.
+"""
+import argparse
+import os
+import random
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from dodge_blocks.constants import INPUT_MODES
+from dodge_blocks.dirty import DirtyRectRenderer
+from dodge_blocks.input import InputTimeline
+from dodge_blocks.render import GameRenderer
+from dodge_blocks.renderers import make_renderer
+from dodge_blocks.simulation import Game
+from dodge_blocks.timestep import FixedTimestep
+
+MODES = [("software", "full"), ("software", "dirty"), ("texture", "full")]
+
+
+def press_keys(seed, stop):
+    """Post holds and sub-tick taps of the arrow keys until `stop` is set"""
+    rng = random.Random(seed)
+    while not stop.is_set():
+        key = rng.choice((pygame.K_LEFT, pygame.K_RIGHT))
+        hold = rng.uniform(0.002, 0.010) if rng.random() < 0.4 else rng.uniform(0.03, 0.2)
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+        time.sleep(hold)
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+        time.sleep(rng.uniform(0.02, 0.15))
+
+
+def run(backend_name, render, input_mode, args):
+    pygame.display.init()
+    backend = make_renderer(backend_name)
+    renderer = GameRenderer()
+    dirty_renderer = DirtyRectRenderer(renderer) if render == "dirty" else None
+    game = Game("Intermediate", seed=args.seed)
+    timestep = FixedTimestep(args.tick_rate)
+    inputs = InputTimeline(input_mode)
+    frame_time = 0.0
+
+    stop = threading.Event()
+    presser = threading.Thread(target=press_keys, args=(args.seed, stop), daemon=True)
+    presser.start()
+    end = time.perf_counter() + args.seconds
+    while time.perf_counter() < end:
+        inputs.receive(pygame.event.get())
+        for left, right in inputs.ticks(timestep.advance(frame_time), timestep.dt):
+            game.tick(left, right)
+            # Keep the game running; only the input path is being measured
+            game.game_over = False
+        if dirty_renderer is not None:
+            backend.present(dirty_renderer.draw(backend.game_frame(), game, timestep.alpha))
+        else:
+            renderer.draw(backend.game_frame(), game, timestep.alpha)
+            backend.present()
+        inputs.latency.presented(time.perf_counter())
+        frame_time = inputs.wait(args.fps)
+    stop.set()
+    presser.join()
+    pygame.display.quit()
+    return inputs.latency.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0, help="play time per run")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for backend_name, render in MODES:
+        for input_mode in reversed(INPUT_MODES):
+            stats = run(backend_name, render, input_mode, args)
+            print(f"{backend_name:>8} {render:>5} {input_mode:>6}: {stats['events']:4d} key changes shown, "
+                  f"{stats['dropped']:3d} taps dropped; press p50 {stats['press_p50_ms']:5.1f} "
+                  f"p99 {stats['press_p99_ms']:5.1f} ms, release p50 {stats['release_p50_ms']:5.1f} "
+                  f"p99 {stats['release_p99_ms']:5.1f} ms, tap release p50 {stats['tap_release_p50_ms']:5.1f} "
+                  f"p99 {stats['tap_release_p99_ms']:5.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
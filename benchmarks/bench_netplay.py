@@ -0,0 +1,166 @@
+"""Measure netplay snapshot size and server tick rate as clients are added.
+
+First every tick of a seeded game is round-tripped through the snapshot
+codec, both as a full snapshot and as a delta against the previous tick, and
+the decoded state must match the game exactly; the difficulties keep only a
+couple of entities on screen, so a crowded setting is measured too. The
+snapshots are also fed to an ``Interpolator`` on a 60 Hz schedule, and a
+frame sampled halfway between two arrivals must show the obstacles moved
+since the frame sampled on arrival. Then an unthrottled server
+runs over localhost with growing numbers of clients (half racing, steered by
+``DodgePolicy`` from the snapshots they receive, half spectating) and reports
+bytes per tick per client and server ticks per second.
+"""
+import argparse
+import asyncio
+import time
+
+from dodge_blocks.constants import DIFFICULTY_SETTINGS
+from dodge_blocks.netplay import (
+    OBSTACLE,
+    ROLE_PLAYER,
+    ROLE_SPECTATOR,
+    Interpolator,
+    NetClient,
+    Server,
+    capture,
+    decode_snapshot,
+    encode_snapshot,
+)
+from dodge_blocks.policies import DodgePolicy
+from dodge_blocks.simulation import Game, Player
+
+# A crowded screen, to show how snapshot size scales with entity count
+BUSY_SETTINGS = {"obstacle_speed": 4, "obstacle_spawn_rate": 4, "bonus_spawn_rate": 8}
+
+
+class SnapshotView:
+    """Just enough of ``Game`` for ``DodgePolicy`` to steer from the newest snapshot"""
+
+    def __init__(self, client):
+        self.client = client
+        self.settings = DIFFICULTY_SETTINGS[client.difficulty]
+        self.player = Player()
+
+    def obstacle_positions(self, alpha=1.0):
+        snapshot = self.client.interpolator.snapshots[-1]
+        self.player.x = snapshot.player_x
+        return [(x, y) for kind, x, y in snapshot.entities.values() if kind == OBSTACLE]
+
+
+def codec_sizes(settings, ticks, seed=0):
+    speed = settings["obstacle_speed"]
+    policy = DodgePolicy()
+    game = Game(settings=settings, seed=seed)
+    baselines = {}
+    previous = None
+    full_bytes = delta_bytes = 0
+    for tick in range(1, ticks + 1):
+        if game.game_over:
+            game.reset()
+        game.tick(*policy(game))
+        snapshot = capture(game, tick)
+
+        full = encode_snapshot(snapshot, None, speed)
+        delta = encode_snapshot(snapshot, previous, speed)
+        for data in (full, delta):
+            decoded = decode_snapshot(data, baselines, speed)
+            actual = (decoded.score, decoded.game_over, decoded.player_x, decoded.entities)
+            expected = (snapshot.score, snapshot.game_over, snapshot.player_x, snapshot.entities)
+            if actual != expected:
+                raise SystemExit(f"tick {tick}: decoded snapshot differs from the game")
+        baselines = {tick: snapshot}
+        previous = snapshot
+        full_bytes += len(full)
+        delta_bytes += len(delta)
+    return full_bytes / ticks, delta_bytes / ticks
+
+
+def interpolation_moves(settings, ticks, tick_rate=60, seed=0):
+    policy = DodgePolicy()
+    game = Game(settings=settings, seed=seed)
+    interpolator = Interpolator(tick_rate)
+    for tick in range(1, ticks + 1):
+        game.tick(*policy(game))
+        if game.game_over:
+            return
+        arrived = tick / tick_rate
+        interpolator.push(capture(game, tick), arrived)
+        if tick <= interpolator.delay + 1:
+            continue
+        older, _, on_arrival, _ = interpolator.sample(arrived)
+        _, _, halfway, _ = interpolator.sample(arrived + 0.5 / tick_rate)
+        # Obstacles about to fall off the screen have nothing to move towards
+        newest = interpolator.snapshots[-1].entities
+        falling = any(kind == OBSTACLE and entity_id in newest
+                      for entity_id, (kind, _, _) in older.entities.items())
+        if falling and on_arrival == halfway:
+            raise SystemExit(f"tick {tick}: interpolated obstacles froze between snapshots")
+
+
+async def drive(client):
+    policy = DodgePolicy()
+    view = SnapshotView(client)
+    while True:
+        if client.interpolator.snapshots:
+            client.send_input(*policy(view))
+        await asyncio.sleep(0)
+
+
+async def serve(difficulty, num_clients, ticks):
+    server = Server(difficulty, seed=1, tick_rate=0)
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    clients = []
+    tasks = []
+    for i in range(num_clients):
+        role = ROLE_PLAYER if i % 2 == 0 else ROLE_SPECTATOR
+        client = NetClient(role, watch=0)
+        await client.connect(port=port)
+        clients.append(client)
+        tasks.append(asyncio.create_task(client.receive()))
+        if role == ROLE_PLAYER:
+            tasks.append(asyncio.create_task(drive(client)))
+
+    start = time.perf_counter()
+    await server.run(ticks)
+    elapsed = time.perf_counter() - start
+
+    for client in clients:
+        client.close()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    listener.close()
+    await listener.wait_closed()
+
+    received = sum(client.bytes_received for client in clients)
+    snapshots = sum(client.snapshots_received for client in clients)
+    skipped = sum(connection.skipped for connection in server.clients)
+    return ticks / elapsed, received / max(snapshots, 1), snapshots / num_clients, skipped, server.encode_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_SETTINGS), default="Pro")
+    parser.add_argument("--codec-ticks", type=int, default=5000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--ticks", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, settings in [*DIFFICULTY_SETTINGS.items(), ("busy", BUSY_SETTINGS)]:
+        full, delta = codec_sizes(settings, args.codec_ticks)
+        print(f"codec {name:>12}: full {full:6.1f} B/tick, delta {delta:5.1f} B/tick "
+              f"({full / delta:.1f}x smaller), round trip exact")
+        interpolation_moves(settings, min(args.codec_ticks, 600))
+    print("interpolation: obstacles move between snapshots")
+
+    print(f"server, {args.difficulty}, {args.ticks} ticks unthrottled over localhost:")
+    for num_clients in args.clients:
+        rate, per_snapshot, delivered, skipped, encode = asyncio.run(serve(args.difficulty, num_clients, args.ticks))
+        print(f"{num_clients:>3} clients: {rate:8,.0f} ticks/s, {per_snapshot:5.1f} B/tick per client, "
+              f"{delivered:6.0f} snapshots each, {skipped} skipped, encoding {encode / args.ticks * 1e6:6.1f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
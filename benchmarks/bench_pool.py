@@ -0,0 +1,138 @@
+"""Stress entity pooling and GC modes with a spawn every tick.
+
+Each configuration runs the same seeded, spawn-heavy game with and without
+entity reuse under every ``GCController`` mode, and reports pool hit rates,
+tick-time percentiles, garbage collections per generation and their longest
+pause during play, and peak traced memory (from a separate tracemalloc pass).
+
+CPython only collects once the number of live container objects has grown,
+and a game that just churns entities frees as much as it allocates, so on
+its own it never triggers a collection. Like the real game, each run first
+builds a long-lived heap standing in for what startup leaves behind (fonts,
+atlas, menus, caches), and then keeps a few entity positions from every tick,
+as a replay or history log would. That growth drives generation-0 and
+generation-1 collections, and eventually full collections that have to walk
+the whole startup heap in ``default`` mode.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from dodge_blocks.pool import GC_MODES, GCController, Pool
+from dodge_blocks.simulation import BonusCircle, Game, Obstacle
+from dodge_blocks.stats import percentile
+
+# A new obstacle every tick and a bonus circle every other tick
+STRESS_SETTINGS = {"obstacle_speed": 4, "obstacle_spawn_rate": 1, "bonus_spawn_rate": 2}
+GENERATIONS = 3
+
+
+class GCPauses:
+    def __init__(self):
+        self.started = 0.0
+        self.pauses = []
+        self.generations = []
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self.started = time.perf_counter()
+        else:
+            self.pauses.append(time.perf_counter() - self.started)
+            self.generations.append(info["generation"])
+
+
+def stress_game(pooled, seed=0):
+    game = Game(settings=STRESS_SETTINGS, seed=seed)
+    if not pooled:
+        # Nothing is kept on release, so every spawn allocates
+        game.obstacle_pool = Pool(Obstacle, max_free=0)
+        game.bonus_pool = Pool(BonusCircle, max_free=0)
+    return game
+
+
+def startup_heap(objects):
+    """Long-lived container objects, as loading fonts, the atlas and menus leaves behind"""
+    return [[i] for i in range(objects)]
+
+
+def run_ticks(game, ticks, retained):
+    samples = []
+    history = []
+    clock = time.perf_counter
+    for _ in range(ticks):
+        start = clock()
+        game.tick()
+        # Keep playing through collisions so the spawn rate never drops
+        game.game_over = False
+        history.append([[obstacle.id, obstacle.y] for obstacle in game.obstacles[-retained:]])
+        samples.append(clock() - start)
+    return samples
+
+
+def stress(pooled, mode, ticks, startup_objects, retained):
+    gc.collect()
+    heap = startup_heap(startup_objects)
+    controller = GCController(mode)
+    controller.startup_done()
+    pauses = GCPauses()
+    gc.callbacks.append(pauses)
+    try:
+        game = stress_game(pooled)
+        controller.begin_gameplay()
+        samples = run_ticks(game, ticks, retained)
+        in_play = list(pauses.pauses)
+        generations = [pauses.generations.count(generation) for generation in range(GENERATIONS)]
+        start = time.perf_counter()
+        controller.end_gameplay()
+        safe_point = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(pauses)
+        controller.restore()
+        del heap
+    samples.sort()
+    return game, samples, in_play, generations, safe_point
+
+
+def peak_memory(pooled, ticks):
+    game = stress_game(pooled)
+    tracemalloc.start()
+    for _ in range(ticks):
+        game.tick()
+        game.game_over = False
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--memory-ticks", type=int, default=5000)
+    parser.add_argument("--startup-objects", type=int, default=300000,
+                        help="long-lived objects allocated before play, which full collections walk")
+    parser.add_argument("--retained", type=int, default=16,
+                        help="entity positions kept from every tick, growing the heap as play goes on")
+    args = parser.parse_args()
+
+    for pooled in (False, True):
+        peak = peak_memory(pooled, args.memory_ticks)
+        label = "pooled" if pooled else "unpooled"
+        print(f"{label}: peak traced memory {peak / 1024:,.0f} KiB over {args.memory_ticks} ticks")
+        for mode in GC_MODES:
+            game, samples, in_play, generations, safe_point = stress(pooled, mode, args.ticks,
+                                                                    args.startup_objects, args.retained)
+            obstacle_stats = game.obstacle_pool.stats()
+            bonus_stats = game.bonus_pool.stats()
+            longest = max(in_play, default=0.0)
+            print(f"  gc {mode:>8}: p50 {percentile(samples, 50) * 1e6:6.1f} us, "
+                  f"p99 {percentile(samples, 99) * 1e6:6.1f} us, max {samples[-1] * 1e3:6.2f} ms | "
+                  f"{len(in_play):>4} collections in play (gen0/1/2 {'/'.join(map(str, generations))}, "
+                  f"longest {longest * 1e3:.2f} ms), "
+                  f"{safe_point * 1e3:.2f} ms at safe point | "
+                  f"pool hit rate obstacles {obstacle_stats['hit_rate']:.1%}, "
+                  f"bonus {bonus_stats['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
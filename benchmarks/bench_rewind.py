@@ -0,0 +1,157 @@
+"""Check rewind restores exact game states and time it with many live entities.
+
+The parity pass plays seeded games with random input, keeps a serialized copy
+of the state at every tick, and repeatedly rewinds by a random amount: the
+restored game must serialize to exactly the state saved for that tick. Dying
+rewinds and retries. A small buffer is included so that wrapping and
+eviction are exercised.
+
+The timing pass fills the screen with slow obstacles outside the player's
+column, records a few seconds of play, then times rewinding two seconds and
+the per-tick cost of recording. It fails unless every rewind finishes within
+a quarter of a 60 Hz frame and recording averages under an eighth of one.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from dodge_blocks.constants import OBSTACLE_SIZE, SCREEN_HEIGHT
+from dodge_blocks.entity_store import ArrayGame
+from dodge_blocks.policies import RandomPolicy
+from dodge_blocks.rewind import RewindBuffer, keyframe_size, write_keyframe
+from dodge_blocks.simulation import Game, Obstacle
+from dodge_blocks.stats import percentile
+
+FRAME_MS = 1000 / 60
+REWIND_BUDGET_MS = FRAME_MS / 4
+RECORD_BUDGET_MS = FRAME_MS / 8
+RESTART_CHECK_TICKS = 600
+
+
+def serialize(game, tick):
+    out = bytearray(keyframe_size(len(game.obstacles), len(game.bonus_circles)))
+    write_keyframe(game, tick, out, 0)
+    return bytes(out)
+
+
+def check_parity(game_cls, seed, ticks, capacity, waves=False):
+    rng = random.Random(seed)
+    game = game_cls("Pro", seed=seed, waves=waves)
+    policy = RandomPolicy(seed)
+    buffer = RewindBuffer(capacity)
+    buffer.start(game)
+    states = [serialize(game, 0)]
+    checked = 0
+    for _ in range(ticks):
+        if game.game_over or rng.random() < 0.01:
+            target = buffer.rewind(game, rng.randint(1, 240))
+            del states[target + 1:]
+            if serialize(game, target) != states[target]:
+                raise SystemExit(f"{game_cls.__name__} seed {seed}: tick {target} restored differently")
+            checked += 1
+            continue
+        left, right = policy(game)
+        buffer.step(game, left, right)
+        states.append(serialize(game, buffer.tick))
+
+    stats = buffer.stats()
+    # A restart must play on exactly like a fresh game of the seed it was given, waves included
+    buffer.restart(game, seed + 1)
+    fresh = game_cls("Pro", game.high_score, seed + 1, waves=waves)
+    for tick in range(RESTART_CHECK_TICKS):
+        if serialize(game, tick) != serialize(fresh, tick):
+            raise SystemExit(f"{game_cls.__name__} seed {seed}: restarted game differs at tick {tick}")
+        left, right = policy(fresh)
+        game.tick(left, right)
+        fresh.tick(left, right)
+    return checked, stats
+
+
+def crowd(game, count, seed=0):
+    """Slow obstacles spread over the screen, none in the idle player's column"""
+    rng = np.random.default_rng(seed)
+    xs = rng.integers(0, game.player.x - OBSTACLE_SIZE - 10, count)
+    ys = rng.integers(-OBSTACLE_SIZE, SCREEN_HEIGHT, count)
+    if isinstance(game, ArrayGame):
+        game.obstacle_store.extend(xs, ys, np.ones(count, dtype=np.int32))
+    else:
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            obstacle = Obstacle(x, 1)
+            obstacle.y = y
+            game.obstacles.append(obstacle)
+
+
+def time_rewind(game_cls, count, ticks, rewind_ticks, repeats):
+    game = game_cls("Beginner", seed=1)
+    crowd(game, count)
+    buffer = RewindBuffer()
+    buffer.start(game)
+    clock = time.perf_counter
+    ticking = 0.0
+    recording = 0.0
+    for _ in range(ticks):
+        # What RewindBuffer.step does, timed in two parts
+        start = clock()
+        game.tick()
+        ticked = clock()
+        buffer.record(game, False, False, ticked - start)
+        ticking += ticked - start
+        recording += clock() - ticked
+    tick_ms = ticking / ticks * 1000
+    record_ms = recording / ticks * 1000
+
+    samples = []
+    for i in range(repeats):
+        start = clock()
+        buffer.rewind(game, rewind_ticks)
+        samples.append((clock() - start) * 1000)
+        # Play on by a varying amount so rewinds land at different distances from a keyframe
+        for _ in range(rewind_ticks + i % 7 * 5):
+            buffer.step(game, False, False)
+    return tick_ms, record_ms, samples, buffer.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--parity-ticks", type=int, default=5000)
+    parser.add_argument("--entities", type=int, nargs="+", default=[0, 1000, 10000])
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--rewind", type=int, default=120, help="ticks per timed rewind")
+    parser.add_argument("--repeats", type=int, default=21)
+    args = parser.parse_args()
+
+    for game_cls, waves in ((Game, False), (ArrayGame, False), (Game, True)):
+        for capacity in (4 * 1024 * 1024, 16 * 1024):
+            checked = 0
+            for seed in range(args.seeds):
+                count, stats = check_parity(game_cls, seed, args.parity_ticks, capacity, waves)
+                checked += count
+            name = game_cls.__name__ + (" waves" if waves else "")
+            print(f"parity {name:>10} {capacity // 1024:>5} KiB: {checked} rewinds and {args.seeds} restarts "
+                  f"restored exactly (last buffer held {stats['span_ticks']} ticks in {stats['records']} keyframes)")
+
+    over_budget = []
+    for game_cls in (Game, ArrayGame):
+        for count in args.entities:
+            tick_ms, record_ms, samples, stats = time_rewind(game_cls, count, args.ticks, args.rewind, args.repeats)
+            samples.sort()
+            p50 = percentile(samples, 50)
+            worst = samples[-1]
+            label = f"{game_cls.__name__:>9} {count:>6} entities"
+            print(f"{label}: tick {tick_ms:6.2f} ms, record {record_ms * 1000:7.1f} us/tick "
+                  f"({record_ms / FRAME_MS:.1%} of a frame), rewind {args.rewind} ticks p50 {p50:5.2f} ms "
+                  f"max {worst:5.2f} ms ({worst / FRAME_MS:.0%} of a frame), "
+                  f"history {stats['span_ticks']} ticks in {stats['records']} keyframes")
+            if worst > REWIND_BUDGET_MS:
+                over_budget.append(f"{label}: rewind took {worst:.2f} ms, budget {REWIND_BUDGET_MS:.2f} ms")
+            if record_ms > RECORD_BUDGET_MS:
+                over_budget.append(f"{label}: recording took {record_ms:.2f} ms/tick, budget {RECORD_BUDGET_MS:.2f} ms")
+    if over_budget:
+        raise SystemExit("over budget:\n" + "\n".join(over_budget))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Measure import cost and headless tick throughput of the simulation core."""
+import argparse
+import random
+import subprocess
+import sys
+import time
+
+from dodge_blocks.constants import DIFFICULTY_SETTINGS
+from dodge_blocks.simulation import Game
+
+IMPORT_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import dodge_blocks.simulation\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, 'pygame' in sys.modules)\n"
+)
+
+
+def measure_import():
+    """Time a cold import of the simulation core in a fresh interpreter"""
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True, check=True)
+    elapsed, pygame_loaded = out.stdout.split()
+    return float(elapsed), pygame_loaded == "True"
+
+
+def run_ticks(difficulty, ticks, seed=0):
+    """Step games with random input for `ticks` ticks, restarting on game over"""
+    policy = random.Random(seed)
+    random.seed(seed)
+    game = Game(difficulty, seed=seed)
+    games = 1
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if game.game_over:
+            game.reset()
+            games += 1
+        move = policy.random()
+        game.tick(left=move < 0.4, right=move > 0.6)
+    elapsed = time.perf_counter() - start
+    return elapsed, games
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=200000)
+    args = parser.parse_args()
+
+    elapsed, pygame_loaded = measure_import()
+    print(f"import dodge_blocks.simulation: {elapsed * 1000:.2f} ms (pygame loaded: {pygame_loaded})")
+
+    for difficulty in DIFFICULTY_SETTINGS:
+        elapsed, games = run_ticks(difficulty, args.ticks)
+        print(f"{difficulty:>12}: {args.ticks / elapsed:,.0f} ticks/s over {games} games")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare primitive and sprite-atlas entity drawing at several entity counts.
+
+Runs under the SDL dummy video driver, so it needs no window.
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from dodge_blocks.constants import BONUS_RADIUS, OBSTACLE_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH
+from dodge_blocks.sprites import draw_bonus_circle, draw_obstacle, get_atlas
+
+
+def make_positions(count, seed=0):
+    rng = random.Random(seed)
+    obstacles = [(rng.randint(0, SCREEN_WIDTH - OBSTACLE_SIZE), rng.randint(-OBSTACLE_SIZE, SCREEN_HEIGHT))
+                 for _ in range(count - count // 4)]
+    bonuses = [(rng.randint(0, SCREEN_WIDTH - 2 * BONUS_RADIUS), rng.randint(-2 * BONUS_RADIUS, SCREEN_HEIGHT))
+               for _ in range(count // 4)]
+    return obstacles, bonuses
+
+
+def draw_primitives(surface, obstacles, bonuses):
+    for x, y in obstacles:
+        draw_obstacle(surface, x, y)
+    for x, y in bonuses:
+        draw_bonus_circle(surface, x, y)
+
+
+def draw_atlas(surface, obstacles, bonuses):
+    atlas = get_atlas()
+    atlas.blit_many(surface, "obstacle", obstacles)
+    atlas.blit_many(surface, "bonus", bonuses)
+
+
+def time_frames(draw, surface, obstacles, bonuses, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        surface.fill((0, 0, 0))
+        draw(surface, obstacles, bonuses)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    get_atlas()  # bake outside the timed region
+
+    for count in args.counts:
+        obstacles, bonuses = make_positions(count)
+        old = time_frames(draw_primitives, surface, obstacles, bonuses, args.frames)
+        new = time_frames(draw_atlas, surface, obstacles, bonuses, args.frames)
+        print(f"{count:>6} entities: primitives {old * 1000:8.3f} ms/frame, "
+              f"atlas {new * 1000:8.3f} ms/frame ({old / new:4.1f}x)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Measure cold start and restart latency of the real main loop.
+
+Each run launches a fresh interpreter under the SDL dummy driver that imports
+``main`` and runs ``main.main()`` with a scripted key sequence. It times:
+
+* ``first_frame``: process launch to the first presented menu frame
+* ``import``: importing ``main`` and the pygame frontend
+* ``first_game_frame``: choosing a difficulty to the first game frame
+* ``restart``: choosing Restart in the pause menu to the next game frame
+
+and prints the median over ``--runs`` runs.
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# frame number -> key pressed during that frame's event handling
+SCRIPT = {2: "RETURN", 3: "RETURN", 10: "p", 12: "DOWN", 13: "RETURN"}
+LAST_FRAME = 20
+
+
+def child(launched_at):
+    start = time.perf_counter()
+    import pygame
+    import main
+    importlib.import_module("dodge_blocks.frontend")
+    import_seconds = time.perf_counter() - start
+
+    from dodge_blocks.resources import registry
+
+    frame = 0
+    pressed_at = {}
+    presented_at = {}
+    original_get = pygame.event.get
+    original_flip = pygame.display.flip
+    original_update = pygame.display.update
+
+    def get(*args, **kwargs):
+        nonlocal frame
+        frame += 1
+        events = list(original_get(*args, **kwargs))
+        key = SCRIPT.get(frame)
+        if key:
+            pressed_at[frame] = time.perf_counter()
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=getattr(pygame, "K_" + key),
+                                             mod=0, unicode="", scancode=0))
+        if frame >= LAST_FRAME:
+            events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def presented():
+        presented_at.setdefault(frame, time.perf_counter())
+
+    def flip():
+        original_flip()
+        presented()
+
+    def update(*args):
+        original_update(*args)
+        presented()
+
+    pygame.event.get = get
+    pygame.display.flip = flip
+    pygame.display.update = update
+    try:
+        main.main(["--seed", "1"])
+    except SystemExit:
+        pass
+
+    def after(press_frame):
+        return presented_at[press_frame] - pressed_at[press_frame]
+
+    result = {
+        "first_frame": presented_at[1] - launched_at,
+        "import": import_seconds,
+        "first_game_frame": after(3),
+        "restart": after(13),
+        "resource_load": registry.stats()["load_seconds"],
+    }
+    print(json.dumps(result))
+
+
+def run_once():
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1", PYTHONPATH=REPO_ROOT)
+    with tempfile.TemporaryDirectory() as workdir:
+        # perf_counter is the system-wide monotonic clock on Linux and macOS,
+        # so the parent's reading stands in for the child's launch time
+        code = f"import time; from benchmarks.bench_startup import child; child({time.perf_counter()!r})"
+        out = subprocess.run([sys.executable, "-c", code], cwd=workdir, env=env,
+                             capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", metavar="PATH", help="write every run's timings as JSON")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    for field in runs[0]:
+        values = [run[field] * 1000 for run in runs]
+        print(f"{field:>16}: median {statistics.median(values):8.2f} ms "
+              f"(min {min(values):.2f}, max {max(values):.2f})")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(runs, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
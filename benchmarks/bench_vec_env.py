@@ -0,0 +1,70 @@
+"""Check VecEnv against Game and measure env-steps per second.
+
+The parity check steps a batch of games with random actions, then replays
+every finished episode in a plain ``Game`` from its seed and actions and
+requires the same final score and length.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from dodge_blocks.constants import DIFFICULTY_SETTINGS
+from dodge_blocks.simulation import Game
+from dodge_blocks.vec_env import LEFT, RIGHT, VecEnv
+
+
+def check_parity(difficulty, num_envs, steps, seed=0):
+    env = VecEnv(num_envs, difficulty, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 3, size=(steps, num_envs))
+    seeds = list(env.seeds)
+    starts = np.zeros(num_envs, dtype=np.int64)
+    checked = 0
+    for t in range(steps):
+        _, _, dones = env.step(actions[t])
+        for i in np.flatnonzero(dones).tolist():
+            game = Game(difficulty, seed=seeds[i])
+            for action in actions[starts[i]:t + 1, i].tolist():
+                game.tick(action == LEFT, action == RIGHT)
+            expected = (game.game_over, game.score, t + 1 - starts[i])
+            actual = (True, int(env.final_scores[i]), int(env.final_ticks[i]))
+            if expected != actual:
+                raise SystemExit(f"{difficulty} env {i} seed {seeds[i]}: Game {expected} != VecEnv {actual}")
+            seeds[i] = env.seeds[i]
+            starts[i] = t + 1
+            checked += 1
+    return checked
+
+
+def throughput(difficulty, num_envs, steps):
+    env = VecEnv(num_envs, difficulty, seed=1)
+    env.reset()
+    actions = np.random.default_rng(1).integers(0, 3, size=(64, num_envs))
+    start = time.perf_counter()
+    for t in range(steps):
+        env.step(actions[t % 64])
+    elapsed = time.perf_counter() - start
+    return num_envs * steps / elapsed, env.episodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parity-envs", type=int, default=64)
+    parser.add_argument("--parity-steps", type=int, default=3000)
+    parser.add_argument("--envs", type=int, nargs="+", default=[1, 64, 1024, 8192])
+    parser.add_argument("--steps", type=int, default=500)
+    args = parser.parse_args()
+
+    for difficulty in DIFFICULTY_SETTINGS:
+        checked = check_parity(difficulty, args.parity_envs, args.parity_steps)
+        print(f"parity {difficulty}: {checked} episodes identical to Game")
+
+    for num_envs in args.envs:
+        rate, episodes = throughput("Intermediate", num_envs, args.steps)
+        print(f"{num_envs:>6} envs: {rate:>12,.0f} env-steps/s ({episodes} episodes finished)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Benchmark suite for the simulation and rendering hot paths.
+
+Every case runs headless under the SDL dummy video driver with fixed seeds and
+fixed entity counts, and reports per-frame timing (mean, p50, p95, p99) plus
+allocation pressure per frame:
+
+* ``alloc_kib``: peak transient memory allocated inside one frame, from
+  ``tracemalloc`` (measured in a separate pass so it doesn't skew timings)
+* ``net_blocks``: change in live interpreter memory blocks per frame
+
+Results can be saved as a JSON baseline and two baselines compared::
+
+    python -m benchmarks --save before.json
+    python -m benchmarks --save after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from benchmarks.bench_entity_store import populate
+from dodge_blocks.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from dodge_blocks.dirty import DirtyRectRenderer
+from dodge_blocks.entity_store import ArrayGame
+from dodge_blocks.menus import DifficultyMenu, Menu, PauseMenu
+from dodge_blocks.policies import RandomPolicy
+from dodge_blocks.render import GameRenderer
+from dodge_blocks.simulation import Game
+from dodge_blocks.stats import percentile
+
+SEED = 1234
+
+
+def loaded_game(game_cls, count, difficulty="Pro"):
+    game = game_cls(difficulty, seed=SEED)
+    populate(game, count, np.random.default_rng(SEED))
+    return game
+
+
+def case_update(game_cls, count):
+    game = loaded_game(game_cls, count)
+
+    def frame():
+        game.update()
+        # Keep the full workload: collisions must not stop the game
+        game.game_over = False
+    return frame
+
+
+def case_play(difficulty):
+    game = Game(difficulty, seed=SEED)
+    policy = RandomPolicy(SEED)
+
+    def frame():
+        if game.game_over:
+            game.reset(SEED)
+        left, right = policy(game)
+        game.tick(left, right)
+    return frame
+
+
+def case_draw(count, use_sprites=True, dirty=False):
+    screen = pygame.display.get_surface()
+    game = loaded_game(Game, count)
+    renderer = GameRenderer(use_sprites)
+    dirty_renderer = DirtyRectRenderer(renderer) if dirty else None
+
+    def frame():
+        game.update()
+        game.game_over = False
+        if dirty_renderer is not None:
+            dirty_renderer.draw(screen, game)
+        else:
+            renderer.draw(screen, game)
+    return frame
+
+
+def case_menus():
+    screen = pygame.display.get_surface()
+    menu = Menu()
+    difficulty_menu = DifficultyMenu()
+    pause_menu = PauseMenu()
+    pause_menu.open(screen)
+    step = [0]
+
+    def frame():
+        step[0] += 1
+        menu.selected_option = step[0] % 2
+        menu.draw(screen)
+        difficulty_menu.selected_option = step[0] % 3
+        difficulty_menu.draw(screen)
+        pause_menu.selected_option = step[0] % 3
+        pause_menu.draw(screen)
+    return frame
+
+
+def case_full_loop(dirty=False):
+    """Input poll, tick, draw and present, as in main() without the frame cap"""
+    screen = pygame.display.get_surface()
+    game = Game("Intermediate", seed=SEED)
+    policy = RandomPolicy(SEED)
+    renderer = GameRenderer()
+    dirty_renderer = DirtyRectRenderer(renderer) if dirty else None
+
+    def frame():
+        pygame.event.pump()
+        pygame.key.get_pressed()
+        if game.game_over:
+            game.reset(SEED)
+            if dirty_renderer is not None:
+                dirty_renderer.invalidate()
+        left, right = policy(game)
+        game.tick(left, right)
+        if dirty_renderer is not None:
+            rects = dirty_renderer.draw(screen, game)
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+        else:
+            renderer.draw(screen, game)
+            pygame.display.flip()
+    return frame
+
+
+CASES = {
+    "update_objects_100": lambda: case_update(Game, 100),
+    "update_objects_1000": lambda: case_update(Game, 1000),
+    "update_arrays_1000": lambda: case_update(ArrayGame, 1000),
+    "update_arrays_10000": lambda: case_update(ArrayGame, 10000),
+    "play_beginner": lambda: case_play("Beginner"),
+    "play_pro": lambda: case_play("Pro"),
+    "draw_sprites_100": lambda: case_draw(100),
+    "draw_sprites_1000": lambda: case_draw(1000),
+    "draw_primitives_1000": lambda: case_draw(1000, use_sprites=False),
+    "draw_dirty_100": lambda: case_draw(100, dirty=True),
+    "menus": case_menus,
+    "full_loop": case_full_loop,
+    "full_loop_dirty": lambda: case_full_loop(dirty=True),
+}
+
+
+def time_frames(frame, frames, warmup):
+    for _ in range(warmup):
+        frame()
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(frames):
+        start = clock()
+        frame()
+        samples.append(clock() - start)
+    return samples
+
+
+def measure_allocations(frame, frames):
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    peaks = []
+    for _ in range(frames):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        frame()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    net_blocks = (sys.getallocatedblocks() - blocks_before) / frames
+    return sum(peaks) / len(peaks) / 1024, net_blocks
+
+
+def run_case(name, frames, warmup):
+    samples = time_frames(CASES[name](), frames, warmup)
+    ordered = sorted(ns / 1e6 for ns in samples)
+    alloc_kib, net_blocks = measure_allocations(CASES[name](), min(frames, 200))
+    return {
+        "frames": frames,
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1],
+        "alloc_kib": alloc_kib,
+        "net_blocks": net_blocks,
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+    }
+
+
+def compare(old, new, threshold):
+    """Print per-case changes; returns the names of cases that regressed"""
+    regressions = []
+    print(f"\ncompared with {old['environment'].get('commit')} ({old['environment'].get('timestamp')}):")
+    for name, stats in new["cases"].items():
+        before = old["cases"].get(name)
+        if before is None:
+            print(f"{name:>22}: new case")
+            continue
+        changes = []
+        for field in ("mean_ms", "p95_ms", "p99_ms"):
+            delta = (stats[field] - before[field]) / before[field] if before[field] else 0.0
+            changes.append(f"{field[:-3]} {delta:+7.1%}")
+        mean_delta = (stats["mean_ms"] - before["mean_ms"]) / before["mean_ms"] if before["mean_ms"] else 0.0
+        flag = ""
+        if mean_delta > threshold:
+            flag = "  <-- slower"
+            regressions.append(name)
+        elif mean_delta < -threshold:
+            flag = "  faster"
+        print(f"{name:>22}: " + ", ".join(changes) + flag)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Dodge Blocks benchmark suite.")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare results with a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative mean slowdown reported as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = {"environment": environment(), "cases": {}}
+    print(f"{'case':>22}  {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}  {'alloc KiB':>9} {'blocks':>7}")
+    for name in args.cases or CASES:
+        stats = run_case(name, args.frames, args.warmup)
+        results["cases"][name] = stats
+        print(f"{name:>22}  {stats['mean_ms']:8.3f} {stats['p50_ms']:8.3f} {stats['p95_ms']:8.3f} "
+              f"{stats['p99_ms']:8.3f}  {stats['alloc_kib']:9.1f} {stats['net_blocks']:7.1f}")
+    pygame.quit()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
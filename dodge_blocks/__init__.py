@@ -0,0 +1,8 @@
+"""Dodge Blocks game package.
+
+The simulation modules (``constants``, ``simulation``, ``leaderboard``) are pure
+Python and never import pygame, so the game logic can be stepped headlessly.
+Everything that touches pygame lives in the rendering/UI adapters
+(``render``, ``menus``) and the ``frontend`` loop, which ``main.py`` only
+imports once it needs a window.
+"""
@@ -0,0 +1,49 @@
+# Constants
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+PLAYER_SIZE = 30
+OBSTACLE_SIZE = 25
+BONUS_RADIUS = 15
+PLAYER_SPEED = 5
+ICON_SIZE = 60
+
+# Difficulty settings
+DIFFICULTY_SETTINGS = {
+    "Beginner": {
+        "obstacle_speed": 8,
+        "obstacle_spawn_rate": 120,
+        "bonus_spawn_rate": 360  # 3x obstacle spawn rate
+    },
+    "Intermediate": {
+        "obstacle_speed": 12,
+        "obstacle_spawn_rate": 80,
+        "bonus_spawn_rate": 240
+    },
+    "Pro": {
+        "obstacle_speed": 16,
+        "obstacle_spawn_rate": 60,
+        "bonus_spawn_rate": 180
+    }
+}
+
+# Frontend choices, kept here so the command line parses without pygame
+RENDERER_NAMES = ("software", "texture")
+INPUT_MODES = ("events", "polled")
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+GREEN = (0, 255, 0)
+GRAY = (128, 128, 128)
+YELLOW = (255, 255, 0)
+LIGHT_BLUE = (100, 150, 255)
+DARK_RED = (150, 0, 0)
+
+# Font sizes
+FONT_LARGE = 72
+FONT_MEDIUM = 48
+FONT_SMALL = 36
+HUD_FONT = 36
+HUD_FONT_SMALL = 24
@@ -0,0 +1,90 @@
+"""Dirty-rectangle rendering for the game screen.
+
+Instead of filling and flipping the whole 800x600 surface every frame,
+``DirtyRectRenderer`` clears only where entities were last frame, redraws the
+scene on top and reports the previous and current entity boxes (plus any HUD
+text that changed) so the caller can present them with
+``pygame.display.update(rects)``. When the dirty area grows past a fraction of
+the screen it redraws everything and asks for a full flip instead.
+"""
+import pygame
+
+from .constants import BLACK, BONUS_RADIUS, OBSTACLE_SIZE, PLAYER_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH
+
+SCREEN_RECT = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+SCREEN_AREA = SCREEN_WIDTH * SCREEN_HEIGHT
+
+
+def entity_rects(game, alpha=1.0):
+    """On-screen bounding boxes of the player, obstacles and bonus circles"""
+    if game.game_over:
+        alpha = 1.0
+    rects = [pygame.Rect(game.player_position(alpha), (PLAYER_SIZE, PLAYER_SIZE))]
+    rects.extend(pygame.Rect(x, y, OBSTACLE_SIZE, OBSTACLE_SIZE) for x, y in game.obstacle_positions(alpha))
+    size = 2 * BONUS_RADIUS
+    rects.extend(pygame.Rect(x, y, size, size) for x, y in game.bonus_positions(alpha))
+    return [rect.clip(SCREEN_RECT) for rect in rects if rect.colliderect(SCREEN_RECT)]
+
+
+class DirtyRectRenderer:
+    def __init__(self, renderer, threshold=0.5):
+        self.renderer = renderer
+        self.threshold = threshold
+        self.previous = []
+        self.previous_hud = []
+        self.hud_key = None
+        self.needs_full = True
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.last_dirty_fraction = 1.0
+
+    def invalidate(self):
+        """Force the next frame to redraw and present the whole screen"""
+        self.needs_full = True
+
+    def draw(self, surface, game, alpha=1.0):
+        """Draw the game and return the rects to present, or None for a full flip"""
+        renderer = self.renderer
+        current = entity_rects(game, alpha)
+        hud_key = (game.score, game.high_score, game.difficulty)
+        hud_changed = hud_key != self.hud_key
+
+        # The game-over screen covers most of the play field, so draw it whole
+        full = self.needs_full or game.game_over
+        if not full:
+            dirty = self.previous + current
+            if hud_changed:
+                dirty += self.previous_hud
+            dirty_area = sum(rect.w * rect.h for rect in dirty)
+            self.last_dirty_fraction = dirty_area / SCREEN_AREA
+            full = self.last_dirty_fraction > self.threshold
+
+        if full:
+            surface.fill(BLACK)
+            self.last_dirty_fraction = 1.0
+        else:
+            for rect in self.previous:
+                surface.fill(BLACK, rect)
+            # Antialiased text blends with what is under it, so the HUD is
+            # always cleared before it is drawn again
+            for rect in self.previous_hud:
+                surface.fill(BLACK, rect)
+
+        renderer.draw_entities(surface, game, alpha)
+        hud = renderer.draw_hud(surface, game)
+        renderer.draw_pause_button(surface)
+        if game.game_over:
+            renderer.draw_game_over(surface, game)
+
+        self.previous = current
+        self.previous_hud = hud
+        self.hud_key = hud_key
+        self.needs_full = False
+
+        if full:
+            self.full_frames += 1
+            return None
+        self.partial_frames += 1
+        if hud_changed:
+            dirty += hud
+        return dirty
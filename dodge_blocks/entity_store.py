@@ -0,0 +1,226 @@
+"""Optional NumPy-backed struct-of-arrays entity store.
+
+``ArrayGame`` is a drop-in replacement for ``Game`` that keeps obstacles and
+bonus circles as parallel x/y/speed/alive arrays instead of lists of objects.
+Each tick moves, culls and collision-tests every entity with a handful of
+array operations, and produces the same scores and game-over ticks as the
+object path for the same random seed and input.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from .collision import CELL_SIZE
+from .constants import BONUS_RADIUS, OBSTACLE_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH
+from .simulation import Game
+
+
+class EntityArrays:
+    """Growable parallel arrays holding one kind of falling entity"""
+
+    def __init__(self, capacity=64):
+        if np is None:
+            raise RuntimeError("the array entity store requires numpy")
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.speed = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        capacity = len(self.x) * 2
+        for name in ("x", "y", "speed", "alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def append(self, x, y, speed):
+        if self.count == len(self.x):
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = speed
+        self.alive[i] = True
+        self.count += 1
+
+    def extend(self, xs, ys, speeds):
+        """Append many entities at once (used by stress tests and benchmarks)"""
+        n = len(xs)
+        while self.count + n > len(self.x):
+            self._grow()
+        end = self.count + n
+        self.x[self.count:end] = xs
+        self.y[self.count:end] = ys
+        self.speed[self.count:end] = speeds
+        self.alive[self.count:end] = True
+        self.count = end
+
+    def compact(self):
+        """Drop dead entities in one pass, keeping spawn order"""
+        n = self.count
+        keep = self.alive[:n]
+        live = int(keep.sum())
+        if live == n:
+            return
+        for name in ("x", "y", "speed"):
+            arr = getattr(self, name)
+            arr[:live] = arr[:n][keep]
+        self.alive[:live] = True
+        self.alive[live:n] = False
+        self.count = live
+
+    def clear(self):
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def positions(self, alpha=1.0):
+        n = self.count
+        y = self.y[:n]
+        if alpha < 1.0:
+            y = y - np.rint(self.speed[:n] * (1.0 - alpha)).astype(np.int32)
+        return zip(self.x[:n].tolist(), y.tolist())
+
+
+class ArrayGame(Game):
+    """Game whose obstacles and bonus circles live in an ``EntityArrays`` store"""
+
+    def __init__(self, difficulty="Intermediate", high_score=0, seed=None, settings=None, waves=False):
+        self.obstacle_store = EntityArrays()
+        self.bonus_store = EntityArrays()
+        super().__init__(difficulty, high_score, seed, settings, waves)
+
+    @property
+    def obstacles(self):
+        return self.obstacle_store
+
+    @obstacles.setter
+    def obstacles(self, value):
+        # Game.__init__ and Game.reset assign a fresh list; empty the store instead
+        self.obstacle_store.clear()
+
+    @property
+    def bonus_circles(self):
+        return self.bonus_store
+
+    @bonus_circles.setter
+    def bonus_circles(self, value):
+        self.bonus_store.clear()
+
+    def release_entities(self):
+        self.obstacle_store.clear()
+        self.bonus_store.clear()
+
+    def entity_columns(self):
+        # Array entities carry no ids
+        columns = []
+        for store in (self.obstacle_store, self.bonus_store):
+            n = store.count
+            columns.append((np.zeros(n, dtype=np.int32), store.x[:n], store.y[:n], store.speed[:n]))
+        return columns
+
+    def load_entity_columns(self, obstacles, bonus_circles):
+        for store, (_, xs, ys, speeds) in ((self.obstacle_store, obstacles), (self.bonus_store, bonus_circles)):
+            store.clear()
+            store.extend(xs, ys, speeds)
+
+    def add_obstacle(self, x):
+        self.obstacle_store.append(x, -OBSTACLE_SIZE, self.settings["obstacle_speed"])
+
+    def spawn_bonus_circle(self):
+        x = self.spawn_x(SCREEN_WIDTH - 2 * BONUS_RADIUS)
+        self.bonus_store.append(x, -2 * BONUS_RADIUS, self.settings["obstacle_speed"])
+
+    def obstacle_positions(self, alpha=1.0):
+        return self.obstacle_store.positions(alpha)
+
+    def bonus_positions(self, alpha=1.0):
+        return self.bonus_store.positions(alpha)
+
+    def grid_near(self, x, y, w, h):
+        """Vectorized uniform-grid broad phase against the player's cells"""
+        player = self.player
+        size = CELL_SIZE
+        near = ((x // size <= (player.x + player.size) // size) &
+                ((x + w) // size >= player.x // size) &
+                (y // size <= (player.y + player.size) // size) &
+                ((y + h) // size >= player.y // size))
+        self.broad_phase.stats.record(len(x), int(near.sum()))
+        return near
+
+    def update_obstacles(self):
+        store = self.obstacle_store
+        n = store.count
+        if n == 0:
+            return
+        player = self.player
+        x = store.x[:n]
+        y = store.y[:n]
+        speed = store.speed[:n]
+        y += speed
+        start_y = y - speed
+
+        off = y > SCREEN_HEIGHT
+        near = self.grid_near(x, start_y, OBSTACLE_SIZE, OBSTACLE_SIZE + speed)
+        idx = np.flatnonzero(near & ~off)
+        if len(idx):
+            # Swept AABB: the obstacle's fall this tick against the player box
+            xs = x[idx]
+            hit = ((xs < player.x + player.size) & (xs + OBSTACLE_SIZE > player.x) &
+                   (start_y[idx] < player.y + player.size) & (y[idx] + OBSTACLE_SIZE > player.y))
+            hits = idx[hit]
+        else:
+            hits = idx
+
+        passed = np.cumsum(off)
+        if len(hits):
+            self.game_over = True
+            # The object path checks the high score at every colliding obstacle,
+            # so the last one (which has seen the most points) decides it
+            score_at_hit = self.score + int(passed[hits[-1]])
+            if score_at_hit > self.high_score:
+                self.high_score = score_at_hit
+                self.new_high_score = True
+
+        cleared = int(passed[-1])
+        if cleared:
+            self.score += cleared
+            store.alive[:n] = ~off
+            store.compact()
+
+    def update_bonus_circles(self):
+        store = self.bonus_store
+        n = store.count
+        if n == 0:
+            return
+        player = self.player
+        x = store.x[:n]
+        y = store.y[:n]
+        speed = store.speed[:n]
+        y += speed
+        start_y = y - speed
+
+        off = y > SCREEN_HEIGHT
+        near = self.grid_near(x, start_y, 2 * BONUS_RADIUS, 2 * BONUS_RADIUS + speed)
+        idx = np.flatnonzero(near & ~off)
+        remove = off
+        if len(idx):
+            # Swept circle against the player box: the gap between the center's
+            # vertical path and the box, compared with the radius
+            center_x = x[idx] + BONUS_RADIUS
+            gap_x = np.maximum(np.maximum(player.x - center_x, center_x - (player.x + player.size)), 0)
+            gap_y = np.maximum(np.maximum(player.y - (y[idx] + BONUS_RADIUS),
+                                          start_y[idx] + BONUS_RADIUS - (player.y + player.size)), 0)
+            hits = idx[gap_x * gap_x + gap_y * gap_y < BONUS_RADIUS * BONUS_RADIUS]
+            if len(hits):
+                self.score += 5 * len(hits)  # Bonus points for collecting circles
+                remove = off.copy()
+                remove[hits] = True
+        if remove.any():
+            store.alive[:n] = ~remove
+            store.compact()
@@ -0,0 +1,284 @@
+"""The interactive pygame frontend: window, menus and the frame loop.
+
+``main.py`` parses the command line and imports this module only when a
+window is needed, so ``--fast-forward`` runs without loading pygame.
+"""
+import os
+import sys
+import time
+
+import pygame
+
+from .dirty import DirtyRectRenderer
+from .input import InputTimeline
+from .leaderboard import Leaderboard
+from .menus import DifficultyMenu, Menu, PauseMenu, handle_game_over_input
+from .overlay import PerfOverlay
+from .pool import GCController
+from .profiler import DRAW, EVENTS, INPUT, PRESENT, UPDATE, WAIT, FrameProfiler, NullProfiler
+from .render import GameRenderer
+from .renderers import make_renderer
+from .replay import InputRecorder
+from .rewind import RewindBuffer
+from .timestep import FixedTimestep
+
+
+# How long a static screen sleeps in the event queue before waking anyway
+# (the profiler overlay, if shown, refreshes at this rate)
+IDLE_WAIT_MS = 250
+# How far back the rewind key (R) steps
+REWIND_SECONDS = 2
+
+
+def save_recording(args, recorder, game):
+    os.makedirs(args.record, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{game.difficulty}-{game.score}.dbr"
+    recorder.finish(game.score).save(os.path.join(args.record, name))
+
+
+def restart_game(args, game, rewinder):
+    """Start the run over from its first tick in place; returns its recorder"""
+    rewinder.restart(game, args.seed)
+    return InputRecorder(game) if args.record else None
+
+
+def resume_play(timestep, inputs, gc_controller, dirty_renderer):
+    # A finished game is playable again without a state change to notice it
+    timestep.reset()
+    inputs.discard()
+    gc_controller.begin_gameplay()
+    if dirty_renderer is not None:
+        dirty_renderer.invalidate()
+
+
+def make_profiler(args):
+    if not (args.profile or args.profile_export or args.cprofile):
+        return NullProfiler()
+    profiler = FrameProfiler(args.profile_frames)
+    if args.cprofile:
+        profiler.profile_window(*args.cprofile, args.cprofile_out)
+    return profiler
+
+
+def quit_game(args, profiler, leaderboard):
+    if args.profile_export and profiler.enabled:
+        profiler.export(args.profile_export)
+    leaderboard.close()
+    pygame.quit()
+    sys.exit()
+
+
+def idle_view(state, game, menu, difficulty_menu, pause_menu):
+    """What a static screen currently shows, or None while a game is running"""
+    if state == "menu":
+        return state, menu.selected_option
+    if state == "difficulty":
+        return state, difficulty_menu.selected_option
+    if state == "pause":
+        return state, pause_menu.selected_option
+    if state == "game" and game.game_over:
+        return state, game.game_over_selection
+    return None
+
+
+def wait_for_events():
+    """Block until an event arrives (or IDLE_WAIT_MS passes) and return all pending events"""
+    first = pygame.event.wait(IDLE_WAIT_MS)
+    events = pygame.event.get()
+    if first.type != pygame.NOEVENT:
+        events.insert(0, first)
+    return events
+
+
+def init_display(args):
+    # Only the display; fonts initialize on first use and audio is never needed
+    pygame.display.init()
+
+    # Display setup
+    return make_renderer(args.renderer, args.window)
+
+
+def run(args, make_game):
+    """Play until the window closes; `make_game(args, difficulty, high_score)` builds each game"""
+    # The only synchronous leaderboard I/O; afterwards reads come from memory
+    leaderboard = Leaderboard().load()
+    backend = init_display(args)
+    inputs = InputTimeline(args.input)
+    timestep = FixedTimestep(args.tick_rate, args.max_substeps)
+    frame_time = 0.0
+    menu = Menu(leaderboard.high_score())
+    difficulty_menu = DifficultyMenu()
+    pause_menu = PauseMenu()
+    renderer = GameRenderer(use_sprites=not args.primitives)
+    dirty_renderer = None
+    if args.render == "dirty":
+        dirty_renderer = DirtyRectRenderer(renderer, args.dirty_threshold)
+    profiler = make_profiler(args)
+    overlay = PerfOverlay()
+    overlay.visible = args.profile
+    gc_controller = GCController(args.gc)
+    gc_controller.startup_done()
+    game = None
+    recorder = None
+    rewinder = RewindBuffer(int(args.rewind_memory * 1024 * 1024))
+    current_state = "menu"  # "menu", "difficulty", "game", "pause", "game_over"
+
+    previous_state = None
+    drawn_view = None
+
+    while True:
+        profiler.begin_frame()
+        if (drawn_view is not None and not inputs.buffered and
+                drawn_view == idle_view(current_state, game, menu, difficulty_menu, pause_menu)):
+            # Nothing on a static screen changes until a key arrives
+            events = wait_for_events()
+            # The time spent blocked there must not reach the simulation as a backlog
+            frame_time = 0.0
+            inputs.restart_frame()
+            profiler.mark(WAIT)
+        else:
+            events = pygame.event.get()
+        events = inputs.receive(events)
+        for event in events:
+            if event.type == pygame.QUIT:
+                quit_game(args, profiler, leaderboard)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                # Profiling costs nothing until the overlay is first shown
+                if not profiler.enabled:
+                    profiler = FrameProfiler(args.profile_frames)
+                    profiler.begin_frame()
+                overlay.toggle()
+                drawn_view = None
+                # The panel was drawn over the paused frame; the frame itself never holds it
+                pause_menu.invalidate()
+                if dirty_renderer is not None:
+                    dirty_renderer.invalidate()
+            elif event.type == pygame.KEYDOWN:
+                if current_state == "menu":
+                    selection = menu.handle_input(event)
+                    if selection == "Play":
+                        current_state = "difficulty"
+                    elif selection == "Exit":
+                        quit_game(args, profiler, leaderboard)
+                elif current_state == "difficulty":
+                    difficulty_selection = difficulty_menu.handle_input(event)
+                    if difficulty_selection:
+                        game = make_game(args, difficulty_selection,
+                                         leaderboard.high_score(difficulty_selection))
+                        if args.record:
+                            recorder = InputRecorder(game)
+                        rewinder.start(game)
+                        current_state = "game"
+                elif current_state == "game":
+                    if event.key == pygame.K_r:
+                        # Step back a few seconds; from the game-over screen this is a retry
+                        was_over = game.game_over
+                        rewinder.rewind(game, REWIND_SECONDS * args.tick_rate)
+                        if recorder is not None:
+                            recorder.truncate(rewinder.tick)
+                        if was_over:
+                            resume_play(timestep, inputs, gc_controller, dirty_renderer)
+                    elif event.key == pygame.K_p and not game.game_over:
+                        current_state = "pause"
+                        pause_menu.open(backend.frame_surface(
+                            lambda surface: renderer.draw(surface, game, timestep.alpha)))
+                        if recorder is not None:
+                            recorder.mark_pause()
+                    elif game.game_over:
+                        game_over_action = handle_game_over_input(game, event)
+                        if game_over_action == "restart":
+                            recorder = restart_game(args, game, rewinder)
+                            resume_play(timestep, inputs, gc_controller, dirty_renderer)
+                        elif game_over_action == "exit":
+                            quit_game(args, profiler, leaderboard)
+                elif current_state == "pause":
+                    selection = pause_menu.handle_input(event)
+                    if selection == "Resume":
+                        current_state = "game"
+                    elif selection == "Restart":
+                        current_state = "game"
+                        recorder = restart_game(args, game, rewinder)
+                    elif selection == "Exit":
+                        quit_game(args, profiler, leaderboard)
+
+        profiler.mark(EVENTS)
+
+        # Rects to present this frame; None means flip the whole screen
+        dirty_rects = None
+        if current_state != previous_state:
+            # Don't let time spent in menus turn into a burst of ticks, or keys pressed there into moves
+            timestep.reset()
+            frame_time = 0.0
+            inputs.restart_frame()
+            inputs.discard()
+            if dirty_renderer is not None:
+                dirty_renderer.invalidate()
+            # Collections only run outside gameplay in "frozen" GC mode
+            if current_state == "game" and not game.game_over:
+                gc_controller.begin_gameplay()
+            else:
+                gc_controller.end_gameplay()
+        previous_state = current_state
+
+        view = idle_view(current_state, game, menu, difficulty_menu, pause_menu)
+        if view is not None and view == drawn_view and (backend.retained or not overlay.visible):
+            # Static screen already on display; only the overlay may need refreshing
+            dirty_rects = []
+        elif current_state == "menu":
+            menu.draw(backend.canvas_frame())
+        elif current_state == "difficulty":
+            difficulty_menu.draw(backend.canvas_frame())
+        elif current_state == "game":
+            if not game.game_over:
+                # Handle player movement; each tick gets the keys pressed during it
+                due = timestep.advance(frame_time)
+                tick_inputs = inputs.ticks(due, timestep.dt)
+                profiler.mark(INPUT)
+
+                for left, right in tick_inputs:
+                    rewinder.step(game, left, right)
+                    if recorder is not None:
+                        recorder.record(left, right)
+                    if game.game_over:
+                        # A rewound run is practice: its score carries the retries,
+                        # so only runs played straight through reach the leaderboard
+                        if not rewinder.rewound:
+                            # Queued for the writer thread; no disk I/O in the frame
+                            leaderboard.submit(game.difficulty, game.score)
+                            menu.high_score = leaderboard.high_score()
+                        else:
+                            # Nor does it get to claim a record on the game-over screen
+                            game.high_score = leaderboard.high_score(game.difficulty)
+                            game.new_high_score = False
+                        gc_controller.end_gameplay()
+                        if recorder is not None:
+                            # Kept going, so a rewind and retry is recorded too
+                            save_recording(args, recorder, game)
+                        break
+                profiler.mark(UPDATE)
+
+            alpha = timestep.alpha
+            if dirty_renderer is not None:
+                dirty_rects = dirty_renderer.draw(backend.game_frame(), game, alpha)
+            else:
+                renderer.draw(backend.game_frame(), game, alpha)
+        elif current_state == "pause":
+            # The game frame was frozen when pausing; only selection changes redraw
+            dirty_rects = pause_menu.draw(backend.canvas_frame())
+        drawn_view = view
+
+        if overlay.visible:
+            overlay_rect = overlay.draw(backend.target, profiler)
+            if dirty_rects is not None:
+                dirty_rects.append(overlay_rect)
+        profiler.mark(DRAW)
+
+        backend.present(dirty_rects)
+        input_latency = inputs.latency.presented(time.perf_counter())
+        profiler.mark(PRESENT)
+        frame_time = inputs.wait(args.fps)
+        profiler.mark(WAIT)
+        if profiler.enabled:
+            profiler.end_frame(len(game.obstacles) + len(game.bonus_circles) if game is not None else 0,
+                               input_latency)
+
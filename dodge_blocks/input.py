@@ -0,0 +1,231 @@
+"""Timestamped movement input, applied to the simulation tick it happened in.
+
+The main loop used to read ``pygame.key.get_pressed()`` once per frame and
+give that state to every tick the frame ran. A tap that began and ended
+between two polls was never seen. When a frame caught up several ticks, a
+press also moved the player in ticks that ran before the key went down.
+
+``InputTimeline`` records every KEYDOWN/KEYUP of a movement key with the time
+it arrived. Between frames it does not sleep out the frame cap. Instead it
+blocks on the event queue, so events are stamped within about a millisecond
+of delivery rather than at the next poll.
+
+The ticks a frame runs are laid out `dt` apart, with the last one ending at
+the poll. Each tick takes the key changes stamped within its own slice of
+time. A key pressed during a tick moves the player in that tick, however
+briefly it was held, so taps are never lost. A key released during a tick
+stops the player in that tick. So when a frame catches up several ticks, a
+key held for part of the frame moves the player only in the ticks it was
+held for.
+
+The exception is a tap pressed and released within one tick. It moves the
+player for that whole tick, so it can only stop the player in the next
+tick, which may be a frame later. Polling would have dropped the tap
+instead. Movement is whole ticks, so a tap's release is the one change that
+applies a tick late: that tick is the cost of not losing the tap.
+
+The ``polled`` mode keeps the old behaviour, for comparison: one held state
+per frame.
+
+``LatencyTracker`` measures the time from each change's timestamp to the
+``present`` of the first frame whose ticks applied it. A tap that no tick
+saw is counted as dropped. Releases of taps are timed apart from other
+releases. Polling drops those taps, so counting their releases with the
+rest would make the two modes' release latency incomparable. The renderer
+draws between the last two ticks, so the movement itself appears up to one
+tick after that present. That delay is the same in both modes and is not
+included.
+"""
+import math
+import time
+from collections import deque
+
+import pygame
+
+from .stats import percentile
+from .replay import LEFT, RIGHT
+
+MOVE_KEYS = {pygame.K_LEFT: LEFT, pygame.K_a: LEFT, pygame.K_RIGHT: RIGHT, pygame.K_d: RIGHT}
+LATENCY_SAMPLES = 1024
+
+
+class LatencyTracker:
+    def __init__(self, capacity=LATENCY_SAMPLES):
+        # Per direction, (timestamp, down) changes no tick has applied yet
+        self.pending = {LEFT: deque(), RIGHT: deque()}
+        self.shown = []  # (timestamp, kind) applied by a tick, waiting for the frame to be presented
+        # Releases of taps a tick took whole, which only the next tick can show
+        self.tap_releases = set()
+        # Seconds for the most recent presses, releases and tap releases
+        self.samples = {kind: deque(maxlen=capacity) for kind in ("press", "release", "tap_release")}
+        self.events = 0
+        self.dropped = 0
+
+    def add(self, stamp, bit, down):
+        self.pending[bit].append((stamp, down))
+
+    def applied(self, bits, until=None):
+        """A tick ran with `bits`, taken from the changes stamped up to `until` (None: all of them)"""
+        for bit, queue in self.pending.items():
+            held = bool(bits & bit)
+            while queue and (until is None or queue[0][0] <= until):
+                stamp, down = queue[0]
+                if down == held:
+                    queue.popleft()
+                    if down:
+                        self.shown.append((stamp, "press"))
+                        if queue and until is not None and queue[0][0] <= until:
+                            self.tap_releases.add((bit, queue[0][0]))
+                    elif (bit, stamp) in self.tap_releases:
+                        self.tap_releases.discard((bit, stamp))
+                        self.shown.append((stamp, "tap_release"))
+                    else:
+                        self.shown.append((stamp, "release"))
+                    # The next change reverses this one, so this tick can't show it
+                    break
+                if len(queue) < 2 or (until is not None and queue[1][0] > until):
+                    # Still ahead of this tick
+                    break
+                # Reversed before any tick saw it
+                queue.popleft()
+                self.tap_releases.discard((bit, stamp))
+                if down:
+                    # A lost tap; its release shows nothing either
+                    queue.popleft()
+                    self.dropped += 1
+
+    def presented(self, now):
+        """Record the input the frame just presented shows; returns its worst latency, 0.0 if none"""
+        if not self.shown:
+            return 0.0
+        worst = 0.0
+        for stamp, kind in self.shown:
+            latency = now - stamp
+            self.samples[kind].append(latency)
+            worst = max(worst, latency)
+        self.events += len(self.shown)
+        self.shown.clear()
+        return worst
+
+    def discard(self):
+        for queue in self.pending.values():
+            queue.clear()
+        self.tap_releases.clear()
+
+    def summary(self):
+        """Event-to-present latency percentiles (ms) of recent presses, releases and tap releases, and counts"""
+        stats = {"events": self.events, "dropped": self.dropped}
+        for name, samples in self.samples.items():
+            ordered = sorted(latency * 1000 for latency in samples)
+            stats[f"{name}_p50_ms"] = percentile(ordered, 50)
+            stats[f"{name}_p99_ms"] = percentile(ordered, 99)
+            stats[f"{name}_max_ms"] = ordered[-1] if ordered else 0.0
+        return stats
+
+
+class InputTimeline:
+    def __init__(self, mode="events", clock=time.perf_counter):
+        self.mode = mode
+        self.clock = clock
+        self.keys_down = set()
+        self.held = 0  # direction bits held after every event received
+        self.tick_state = 0  # bits held at the end of the last tick
+        self.changes = deque()  # (timestamp, bits held from then on) not yet given to a tick
+        self.buffered = []  # events that arrived while waiting for the next frame
+        self.frame_start = clock()
+        self.latency = LatencyTracker()
+
+    def record(self, event, stamp):
+        """Note a movement key change at `stamp`"""
+        if event.type != pygame.KEYDOWN and event.type != pygame.KEYUP:
+            return
+        bit = MOVE_KEYS.get(event.key)
+        if bit is None:
+            return
+        if event.type == pygame.KEYDOWN:
+            self.keys_down.add(event.key)
+        else:
+            self.keys_down.discard(event.key)
+        # Either of two keys can hold a direction
+        held = 0
+        for key in self.keys_down:
+            held |= MOVE_KEYS[key]
+        changed = held ^ self.held
+        if not changed:
+            return
+        self.held = held
+        if self.mode == "events":
+            self.changes.append((stamp, held))
+        for direction in (LEFT, RIGHT):
+            if changed & direction:
+                self.latency.add(stamp, direction, bool(held & direction))
+
+    def receive(self, events):
+        """Stamp freshly polled events; returns them after any that arrived during the last wait"""
+        now = self.clock()
+        for event in events:
+            self.record(event, now)
+        if self.buffered:
+            events = self.buffered + list(events)
+            self.buffered = []
+        return events
+
+    def wait(self, fps):
+        """Wait out a frame capped at `fps` (0: uncapped), stamping events as they arrive.
+
+        Returns the seconds since the previous call, like ``Clock.tick``.
+        """
+        if fps:
+            deadline = self.frame_start + 1.0 / fps
+            while True:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    break
+                # Rounded up: waking before the deadline could leave the next frame no tick to run
+                event = pygame.event.wait(math.ceil(remaining * 1000))
+                if event.type != pygame.NOEVENT:
+                    self.record(event, self.clock())
+                    self.buffered.append(event)
+        now = self.clock()
+        frame_time = now - self.frame_start
+        self.frame_start = now
+        return frame_time
+
+    def restart_frame(self):
+        """Start timing the current frame from now, e.g. after blocking on an idle screen"""
+        self.frame_start = self.clock()
+
+    def take(self, tick_end):
+        """Direction bits for the tick ending at `tick_end`, consuming the changes stamped before then"""
+        changes = self.changes
+        state = self.tick_state
+        pressed = 0
+        while changes and changes[0][0] <= tick_end:
+            new = changes.popleft()[1]
+            # A press counts even if released again within the tick
+            pressed |= new & ~state
+            state = new
+        self.tick_state = state
+        return pressed | state
+
+    def ticks(self, due, dt):
+        """Yield (left, right) for each of `due` ticks `dt` apart, oldest first.
+
+        The last tick ends now, so it takes everything received so far. Stop
+        iterating early and the changes for the ticks not run stay queued.
+        """
+        now = self.clock()
+        for i in range(due):
+            if self.mode == "polled":
+                bits, until = self.held, None
+            else:
+                until = now - (due - 1 - i) * dt
+                bits = self.take(until)
+            self.latency.applied(bits, until)
+            yield bool(bits & LEFT), bool(bits & RIGHT)
+
+    def discard(self):
+        """Forget queued changes, e.g. from keys pressed while no game was running"""
+        self.changes.clear()
+        self.tick_state = self.held
+        self.latency.discard()
@@ -0,0 +1,65 @@
+"""Cached static UI layers.
+
+Much of each screen never changes from frame to frame: menu titles and
+instructions, the pause button, the vector icons. A ``Layer`` paints its
+content once into an off-screen surface and is blitted from then on; it is
+repainted only when the key passed in (the inputs it depends on, such as the
+selected option or the score) differs from the one it was painted with.
+
+Opaque layers start from the black screen background. Transparent layers are
+color-keyed like the sprite atlas, which keeps hard-edged ``pygame.draw``
+shapes pixel-identical, but keying would drop the blended edges of
+antialiased text. Alpha layers keep per-pixel alpha instead: text blitted
+onto their cleared surface is copied unchanged, so a whole block of text and
+shapes can be cached and blended over the game exactly as if each piece had
+been blitted directly.
+
+A repaint starts from a new surface, so anything holding on to the old one
+(the texture backend uploads each surface once) sees the change.
+"""
+import pygame
+
+from .constants import BLACK
+from .sprites import COLORKEY
+
+_UNPAINTED = object()
+
+
+class Layer:
+    def __init__(self, size, paint, opaque=False, alpha=False):
+        """`paint(surface, key)` draws the layer's content at layer-local coordinates"""
+        self.size = size
+        self.opaque = opaque
+        self.alpha = alpha
+        self.surface = None  # created by the first render
+        self.paint = paint
+        self.key = _UNPAINTED
+        self.repaints = 0
+
+    def new_surface(self):
+        if self.alpha:
+            surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            surface.fill((0, 0, 0, 0))
+        elif self.opaque:
+            surface = pygame.Surface(self.size)
+            surface.fill(BLACK)
+        else:
+            surface = pygame.Surface(self.size)
+            surface.fill(COLORKEY)
+            surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return surface
+
+    def render(self, key=None):
+        """Return the layer surface, repainting it first if `key` changed"""
+        if key != self.key:
+            self.surface = self.new_surface()
+            self.paint(self.surface, key)
+            self.key = key
+            self.repaints += 1
+        return self.surface
+
+    def blit(self, target, position, key=None):
+        return target.blit(self.render(key), position)
+
+    def invalidate(self):
+        self.key = _UNPAINTED
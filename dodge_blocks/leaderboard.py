@@ -0,0 +1,175 @@
+"""Per-difficulty top-N leaderboard kept in memory and persisted in the background.
+
+Scores live in an append-only log with one JSON object per line. The log is
+read and compacted once at startup: the surviving top-N entries are written
+to a temp file that then atomically replaces the log, so a crash at any point
+leaves either the old or the new file. After that every read is served from
+memory, and ``submit`` only queues a line for the writer thread, so the frame
+loop never waits on the disk. A line torn by a crash mid-append is skipped
+on the next load.
+
+The old single-score ``high_score.json`` is migrated on first load as an
+Intermediate entry (the default difficulty) and renamed to ``.bak``.
+"""
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from .constants import DIFFICULTY_SETTINGS
+
+LEADERBOARD_FILE = "leaderboard.jsonl"
+LEGACY_HIGH_SCORE_FILE = "high_score.json"
+LEGACY_DIFFICULTY = "Intermediate"
+TOP_N = 10
+
+
+class Leaderboard:
+    def __init__(self, path=LEADERBOARD_FILE, top_n=TOP_N, legacy_path=LEGACY_HIGH_SCORE_FILE):
+        self.path = path
+        self.top_n = top_n
+        self.legacy_path = legacy_path
+        # difficulty -> [(score, timestamp)], best first
+        self.entries = {difficulty: [] for difficulty in DIFFICULTY_SETTINGS}
+        self.last_error = None
+        self.pending = queue.Queue()
+        self.writer = None
+
+    def load(self):
+        """Read, migrate and compact the log, then start the writer thread"""
+        readable = True
+        skipped = 0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if not self.add_line(line):
+                        skipped += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Leave an unreadable log alone rather than compacting it to nothing
+            readable = False
+            self.report(f"could not read {self.path}: {e}")
+        if skipped:
+            self.report(f"skipped {skipped} corrupt line(s) in {self.path}")
+
+        migrated = readable and self.migrate_legacy()
+        if readable:
+            try:
+                self.compact()
+            except OSError as e:
+                self.report(f"could not compact {self.path}: {e}")
+            else:
+                if migrated:
+                    self.retire_legacy()
+
+        self.writer = threading.Thread(target=self.write_loop, name="leaderboard-writer", daemon=True)
+        self.writer.start()
+        return self
+
+    def add_line(self, line):
+        if not line.strip():
+            return True
+        try:
+            record = json.loads(line)
+            difficulty = record["difficulty"]
+            score = int(record["score"])
+            timestamp = int(record.get("time", 0))
+        except (ValueError, KeyError, TypeError):
+            return False
+        if difficulty not in self.entries:
+            return False
+        self.insert(difficulty, score, timestamp)
+        return True
+
+    def migrate_legacy(self):
+        try:
+            with open(self.legacy_path, encoding="utf-8") as f:
+                score = int(json.load(f).get("high_score", 0))
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self.report(f"could not migrate {self.legacy_path}: {e}")
+            return False
+        if score > 0:
+            self.insert(LEGACY_DIFFICULTY, score, int(os.path.getmtime(self.legacy_path)))
+        return True
+
+    def retire_legacy(self):
+        try:
+            os.replace(self.legacy_path, self.legacy_path + ".bak")
+        except OSError as e:
+            self.report(f"could not rename {self.legacy_path}: {e}")
+
+    def compact(self):
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for difficulty, entries in self.entries.items():
+                for score, timestamp in entries:
+                    f.write(encode(difficulty, score, timestamp))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def insert(self, difficulty, score, timestamp):
+        """Insert a score in memory; returns its 1-based rank, or None if it missed the top N"""
+        entries = self.entries[difficulty]
+        rank = 0
+        # Ties go after existing entries so earlier scores keep their place
+        while rank < len(entries) and entries[rank][0] >= score:
+            rank += 1
+        if rank >= self.top_n:
+            return None
+        entries.insert(rank, (score, timestamp))
+        del entries[self.top_n:]
+        return rank + 1
+
+    def submit(self, difficulty, score):
+        """Record a finished game; returns its rank. Persisting happens on the writer thread."""
+        if score <= 0:
+            return None
+        timestamp = int(time.time())
+        rank = self.insert(difficulty, score, timestamp)
+        if rank is not None:
+            self.pending.put(encode(difficulty, score, timestamp))
+        return rank
+
+    def high_score(self, difficulty=None):
+        """Best score for a difficulty, or across all of them"""
+        if difficulty is not None:
+            entries = self.entries[difficulty]
+            return entries[0][0] if entries else 0
+        return max((entries[0][0] for entries in self.entries.values() if entries), default=0)
+
+    def top(self, difficulty):
+        return list(self.entries[difficulty])
+
+    def write_loop(self):
+        while True:
+            line = self.pending.get()
+            if line is None:
+                return
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                self.report(f"could not save score to {self.path}: {e}")
+
+    def close(self, timeout=2.0):
+        """Flush queued scores and stop the writer thread"""
+        if self.writer is not None:
+            self.pending.put(None)
+            self.writer.join(timeout)
+            self.writer = None
+
+    def report(self, message):
+        self.last_error = message
+        print(f"leaderboard: {message}", file=sys.stderr)
+
+
+def encode(difficulty, score, timestamp):
+    return json.dumps({"difficulty": difficulty, "score": score, "time": timestamp}) + "\n"
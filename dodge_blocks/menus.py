@@ -0,0 +1,244 @@
+"""pygame menu screens and menu input handling."""
+import pygame
+
+from .constants import (
+    BLACK,
+    FONT_LARGE,
+    FONT_MEDIUM,
+    FONT_SMALL,
+    GRAY,
+    GREEN,
+    ICON_SIZE,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    WHITE,
+    YELLOW,
+)
+from .layers import Layer
+from .text_cache import render_text
+
+
+class Menu:
+    def __init__(self, high_score=0):
+        self.selected_option = 0
+        self.options = ["Play", "Exit"]
+        self.high_score = high_score
+        # Title, high score and instructions; repainted only when the high score changes
+        self.background = Layer((SCREEN_WIDTH, SCREEN_HEIGHT), self.paint_background, opaque=True)
+
+    def draw(self, surface):
+        self.background.blit(surface, (0, 0), self.high_score)
+
+        # Draw options
+        for i, option in enumerate(self.options):
+            color = GREEN if i == self.selected_option else WHITE
+            text = render_text(None, FONT_MEDIUM, option, color)
+            text_rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + i * 60))
+            surface.blit(text, text_rect)
+
+    def paint_background(self, surface, high_score):
+        # Draw title
+        title_text = render_text(None, FONT_LARGE, "DODGE BLOCKS!", YELLOW)
+        title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//4))
+        surface.blit(title_text, title_rect)
+
+        # Draw high score
+        high_score_text = render_text(None, FONT_SMALL, f"High Score: {high_score}", YELLOW)
+        high_score_rect = high_score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 80))
+        surface.blit(high_score_text, high_score_rect)
+
+        # Draw instructions
+        instruction_text = render_text(None, FONT_SMALL, "Use UP/DOWN arrows to navigate, ENTER to select", GRAY)
+        instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 50))
+        surface.blit(instruction_text, instruction_rect)
+
+    def handle_input(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.selected_option = (self.selected_option - 1) % len(self.options)
+            elif event.key == pygame.K_DOWN:
+                self.selected_option = (self.selected_option + 1) % len(self.options)
+            elif event.key == pygame.K_RETURN:
+                return self.options[self.selected_option]
+        return None
+
+
+class DifficultyMenu:
+    def __init__(self):
+        self.selected_option = 0
+        self.options = ["Beginner", "Intermediate", "Pro"]
+        self.background = Layer((SCREEN_WIDTH, SCREEN_HEIGHT), self.paint_background, opaque=True)
+
+    def draw(self, surface):
+        self.background.blit(surface, (0, 0))
+
+        # Draw difficulty options
+        for i, option in enumerate(self.options):
+            color = GREEN if i == self.selected_option else WHITE
+            text = render_text(None, FONT_MEDIUM, option, color)
+            text_rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + i * 60))
+            surface.blit(text, text_rect)
+
+    def paint_background(self, surface, key):
+        # Draw title
+        title_text = render_text(None, FONT_LARGE, "SELECT DIFFICULTY", YELLOW)
+        title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//4))
+        surface.blit(title_text, title_rect)
+
+        # Draw instructions
+        instruction_text = render_text(None, FONT_SMALL, "Use UP/DOWN arrows to navigate, ENTER to select", GRAY)
+        instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 50))
+        surface.blit(instruction_text, instruction_rect)
+
+    def handle_input(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.selected_option = (self.selected_option - 1) % len(self.options)
+            elif event.key == pygame.K_DOWN:
+                self.selected_option = (self.selected_option + 1) % len(self.options)
+            elif event.key == pygame.K_RETURN:
+                return self.options[self.selected_option]
+        return None
+
+
+class PauseMenu:
+    def __init__(self):
+        self.selected_option = 0
+        self.options = ["Resume", "Restart", "Exit"]
+        self.icons = [self.draw_pause_icon, self.draw_restart_icon, self.draw_exit_icon]
+        # Each icon is drawn once in each highlight color, then only blitted
+        self.icon_layers = [{color: Layer((ICON_SIZE, ICON_SIZE), self.icon_painter(icon)) for color in (WHITE, GREEN)}
+                            for icon in self.icons]
+        self.option_rects = [None] * len(self.options)
+        self.drawn_selection = None
+
+        # Allocated once and reused for every pause
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.overlay.set_alpha(128)
+        self.overlay.fill(BLACK)
+
+    def icon_painter(self, icon):
+        def paint(surface, color):
+            icon(surface, 0, 0, ICON_SIZE, color)
+        return paint
+
+    def draw_pause_icon(self, surface, x, y, size, color):
+        # Draw pause icon (two vertical bars)
+        bar_width = size // 6
+        bar_height = size // 2
+        bar_spacing = size // 4
+
+        pygame.draw.rect(surface, color, (x + bar_spacing, y + (size - bar_height)//2, bar_width, bar_height))
+        pygame.draw.rect(surface, color, (x + size - bar_spacing - bar_width, y + (size - bar_height)//2, bar_width, bar_height))
+
+    def draw_restart_icon(self, surface, x, y, size, color):
+        # Draw restart icon (circular arrow)
+        center_x, center_y = x + size//2, y + size//2
+        radius = size//3
+
+        # Draw circle
+        pygame.draw.circle(surface, color, (center_x, center_y), radius, 3)
+
+        # Draw arrow head
+        arrow_points = [
+            (center_x + radius//2, center_y - radius//2),
+            (center_x + radius//2 + 8, center_y - radius//2),
+            (center_x + radius//2 + 4, center_y - radius//2 - 8)
+        ]
+        pygame.draw.polygon(surface, color, arrow_points)
+
+    def draw_exit_icon(self, surface, x, y, size, color):
+        # Draw exit icon (X)
+        margin = size // 4
+        pygame.draw.line(surface, color, (x + margin, y + margin), (x + size - margin, y + size - margin), 4)
+        pygame.draw.line(surface, color, (x + size - margin, y + margin), (x + margin, y + size - margin), 4)
+
+    def open(self, frame):
+        """Freeze the current game frame as the pause background.
+
+        The dimmed frame, title and hint are composed once here; after that
+        ``draw`` only touches the icon/label regions whose highlight changed.
+        """
+        background = self.background
+        background.blit(frame, (0, 0))
+        background.blit(self.overlay, (0, 0))
+
+        # Draw pause title
+        title_text = render_text(None, FONT_LARGE, "PAUSED", YELLOW)
+        title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//4))
+        background.blit(title_text, title_rect)
+
+        # Draw navigation hint
+        hint_text = render_text(None, FONT_SMALL, "Use ↑ ↓ arrows to navigate, ENTER to select", GRAY)
+        hint_rect = hint_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 50))
+        background.blit(hint_text, hint_rect)
+
+        self.drawn_selection = None
+
+    def invalidate(self):
+        """Repaint the whole screen on the next draw, e.g. after something was drawn over it"""
+        self.drawn_selection = None
+
+    def draw_option(self, surface, index):
+        # Draw icons with labels vertically
+        icon_x = SCREEN_WIDTH//2 - ICON_SIZE//2
+        start_y = SCREEN_HEIGHT//2 - 80
+        spacing = 100
+
+        y = start_y + spacing * index
+        color = GREEN if self.selected_option == index else WHITE
+        self.icon_layers[index][color].blit(surface, (icon_x, y), color)
+        text = render_text(None, FONT_SMALL, self.options[index], color)
+        text_rect = text.get_rect(center=(SCREEN_WIDTH//2, y + ICON_SIZE + 15))
+        surface.blit(text, text_rect)
+        return text_rect.union((icon_x, y, ICON_SIZE, ICON_SIZE)).inflate(4, 4)
+
+    def draw(self, surface):
+        """Draw whatever changed since the last call.
+
+        Returns None when the whole screen was drawn, otherwise the (possibly
+        empty) list of rects that need presenting.
+        """
+        if self.drawn_selection is None:
+            surface.blit(self.background, (0, 0))
+            for index in range(len(self.options)):
+                self.option_rects[index] = self.draw_option(surface, index)
+            self.drawn_selection = self.selected_option
+            return None
+
+        if self.drawn_selection == self.selected_option:
+            return []
+
+        rects = []
+        for index in (self.drawn_selection, self.selected_option):
+            rect = self.option_rects[index]
+            surface.blit(self.background, rect, rect)
+            self.option_rects[index] = self.draw_option(surface, index)
+            rects.append(rect.union(self.option_rects[index]))
+        self.drawn_selection = self.selected_option
+        return rects
+
+    def handle_input(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.selected_option = (self.selected_option - 1) % len(self.options)
+            elif event.key == pygame.K_DOWN:
+                self.selected_option = (self.selected_option + 1) % len(self.options)
+            elif event.key == pygame.K_RETURN:
+                return self.options[self.selected_option]
+        return None
+
+
+def handle_game_over_input(game, event):
+    if event.type == pygame.KEYDOWN:
+        if event.key == pygame.K_LEFT:
+            game.game_over_selection = (game.game_over_selection - 1) % 2
+        elif event.key == pygame.K_RIGHT:
+            game.game_over_selection = (game.game_over_selection + 1) % 2
+        elif event.key == pygame.K_RETURN:
+            if game.game_over_selection == 0:  # Restart
+                return "restart"
+            elif game.game_over_selection == 1:  # Exit
+                return "exit"
+    return None
@@ -0,0 +1,615 @@
+"""Local-network racing and spectating over asyncio streams.
+
+The server runs one ``Game`` per player, all from the same seed, so everyone
+races the same obstacle pattern; spectators follow any player's game. Every
+tick each client gets a snapshot of the game it follows::
+
+    python -m dodge_blocks.netplay server --difficulty Pro --seed 7
+    python -m dodge_blocks.netplay client             # play
+    python -m dodge_blocks.netplay client --watch 0   # spectate player 0
+
+Messages are a uint16 length followed by the payload, whose first byte is
+the message type. Snapshots are delta-compressed against the last snapshot
+the client acknowledged: entities fall a fixed ``speed`` per tick, so the
+baseline is advanced by the tick gap and only spawns, removals and entities
+that moved differently are sent. Positions are quantized: the player's x in
+``PLAYER_SPEED`` steps (one byte), an entity's kind and x packed in 16 bits
+and its y as int16. Ticks and scores are varints and the baseline is sent as
+its distance back from the snapshot's tick (0 for a full snapshot), so a
+steady-state delta is about eight bytes.
+
+Clients render ``INTERPOLATION_DELAY`` ticks behind the newest snapshot and
+interpolate between the two snapshots around that time, so the picture stays
+smooth when snapshots arrive unevenly or are skipped for a slow client.
+"""
+import argparse
+import asyncio
+import bisect
+import struct
+import sys
+import time
+from collections import deque
+
+from .constants import DIFFICULTY_SETTINGS, PLAYER_SPEED
+from .replay import DIFFICULTIES, LEFT, RIGHT, ReplayError, read_varint, write_varint
+from .simulation import Game, Player, new_seed
+
+VERSION = 1
+DEFAULT_PORT = 47800
+
+# Message types
+HELLO = 1
+SNAPSHOT = 2
+JOIN = 10
+ACK = 11
+INPUT = 12
+
+LENGTH = struct.Struct("<H")
+HELLO_MESSAGE = struct.Struct("<BBBQHHB")  # type, version, difficulty, seed, tick rate, speed, player
+JOIN_MESSAGE = struct.Struct("<BBB")  # type, role, watched player
+ACK_MESSAGE = struct.Struct("<BI")
+INPUT_MESSAGE = struct.Struct("<BB")
+ENTITY = struct.Struct("<Hh")  # kind << 15 | x, y
+MOVED = struct.Struct("<h")
+
+SPECTATOR = 0xFF
+ROLE_PLAYER = 0
+ROLE_SPECTATOR = 1
+
+FLAG_GAME_OVER = 1
+FLAG_SCOREBOARD = 2
+
+OBSTACLE = 0
+BONUS = 1
+
+# Snapshots kept per client while waiting for acks, and by clients as baselines
+HISTORY = 128
+# Skip a client's snapshot while this much is still queued for it
+SEND_BUFFER_LIMIT = 64 * 1024
+INTERPOLATION_DELAY = 2
+RESTART_DELAY_TICKS = 180
+
+
+class NetError(ValueError):
+    pass
+
+
+class Snapshot:
+    __slots__ = ("tick", "score", "game_over", "player_x", "entities", "scoreboard")
+
+    def __init__(self, tick, score, game_over, player_x, entities, scoreboard=()):
+        self.tick = tick
+        self.score = score
+        self.game_over = game_over
+        self.player_x = player_x
+        self.entities = entities  # id -> (kind, x, y)
+        self.scoreboard = scoreboard  # ((player, score, game over), ...)
+
+
+def capture(game, tick, scoreboard=()):
+    entities = {}
+    for obstacle in game.obstacles:
+        entities[obstacle.id] = (OBSTACLE, obstacle.x, obstacle.y)
+    for circle in game.bonus_circles:
+        entities[circle.id] = (BONUS, circle.x, circle.y)
+    return Snapshot(tick, game.score, game.game_over, game.player.x, entities, scoreboard)
+
+
+def predict(base, tick, speed):
+    """The baseline's entities advanced to `tick`, as both ends assume they moved"""
+    fall = 0 if base.game_over else speed * (tick - base.tick)
+    return {entity_id: (kind, x, y + fall) for entity_id, (kind, x, y) in base.entities.items()}
+
+
+def write_ids(out, ids):
+    write_varint(out, len(ids))
+    previous = 0
+    for entity_id in ids:
+        write_varint(out, entity_id - previous)
+        previous = entity_id
+
+
+def encode_snapshot(snapshot, base, speed):
+    flags = FLAG_GAME_OVER if snapshot.game_over else 0
+    if base is None or snapshot.scoreboard != base.scoreboard:
+        flags |= FLAG_SCOREBOARD
+    out = bytearray((SNAPSHOT,))
+    write_varint(out, snapshot.tick)
+    write_varint(out, 0 if base is None else snapshot.tick - base.tick)
+    out.append(flags)
+    write_varint(out, snapshot.score)
+    out.append(snapshot.player_x // PLAYER_SPEED)
+
+    predicted = {} if base is None else predict(base, snapshot.tick, speed)
+    entities = snapshot.entities
+    write_ids(out, sorted(entity_id for entity_id in predicted if entity_id not in entities))
+
+    added = []
+    moved = []
+    for entity_id in sorted(entities):
+        expected = predicted.get(entity_id)
+        if expected is None:
+            added.append(entity_id)
+        elif expected != entities[entity_id]:
+            moved.append(entity_id)
+
+    write_varint(out, len(added))
+    previous = 0
+    for entity_id in added:
+        kind, x, y = entities[entity_id]
+        write_varint(out, entity_id - previous)
+        out += ENTITY.pack(kind << 15 | x, y)
+        previous = entity_id
+
+    write_varint(out, len(moved))
+    previous = 0
+    for entity_id in moved:
+        write_varint(out, entity_id - previous)
+        out += MOVED.pack(entities[entity_id][2])
+        previous = entity_id
+
+    if flags & FLAG_SCOREBOARD:
+        write_varint(out, len(snapshot.scoreboard))
+        for player, score, game_over in snapshot.scoreboard:
+            write_varint(out, player)
+            write_varint(out, score)
+            out.append(1 if game_over else 0)
+    return bytes(out)
+
+
+def read_ids(data, pos):
+    count, pos = read_varint(data, pos)
+    ids = []
+    entity_id = 0
+    for _ in range(count):
+        delta, pos = read_varint(data, pos)
+        entity_id += delta
+        ids.append(entity_id)
+    return ids, pos
+
+
+def decode_snapshot(data, baselines, speed):
+    """Rebuild a snapshot from `data` and the client's previously decoded `baselines` (tick -> Snapshot)"""
+    try:
+        tick, pos = read_varint(data, 1)
+        distance, pos = read_varint(data, pos)
+        flags = data[pos]
+        score, pos = read_varint(data, pos + 1)
+        player_q = data[pos]
+        pos += 1
+        base = None
+        if distance:
+            base = baselines.get(tick - distance)
+            if base is None:
+                raise NetError(f"snapshot {tick} is a delta against unknown tick {tick - distance}")
+        entities = {} if base is None else predict(base, tick, speed)
+
+        removed, pos = read_ids(data, pos)
+        for entity_id in removed:
+            del entities[entity_id]
+
+        count, pos = read_varint(data, pos)
+        entity_id = 0
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            entity_id += delta
+            packed, y = ENTITY.unpack_from(data, pos)
+            pos += ENTITY.size
+            entities[entity_id] = (packed >> 15, packed & 0x7FFF, y)
+
+        count, pos = read_varint(data, pos)
+        entity_id = 0
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            entity_id += delta
+            (y,) = MOVED.unpack_from(data, pos)
+            pos += MOVED.size
+            kind, x, _ = entities[entity_id]
+            entities[entity_id] = (kind, x, y)
+
+        scoreboard = () if base is None else base.scoreboard
+        if flags & FLAG_SCOREBOARD:
+            count, pos = read_varint(data, pos)
+            rows = []
+            for _ in range(count):
+                player, pos = read_varint(data, pos)
+                player_score, pos = read_varint(data, pos)
+                rows.append((player, player_score, bool(data[pos])))
+                pos += 1
+            scoreboard = tuple(rows)
+    except (struct.error, KeyError, IndexError, ReplayError) as e:
+        raise NetError(f"malformed snapshot: {e}") from e
+    return Snapshot(tick, score, bool(flags & FLAG_GAME_OVER), player_q * PLAYER_SPEED, entities, scoreboard)
+
+
+def frame(payload):
+    return LENGTH.pack(len(payload)) + payload
+
+
+async def read_message(reader):
+    header = await reader.readexactly(LENGTH.size)
+    return await reader.readexactly(LENGTH.unpack(header)[0])
+
+
+class ClientConnection:
+    """Server-side state for one connected client"""
+
+    def __init__(self, writer, player, watch):
+        self.writer = writer
+        self.player = player  # None for spectators
+        self.watch = watch
+        self.sent = {}  # tick -> Snapshot awaiting an ack
+        self.acked = None
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self.skipped = 0
+
+    def acknowledge(self, tick):
+        snapshot = self.sent.get(tick)
+        if snapshot is None or (self.acked is not None and tick <= self.acked.tick):
+            return
+        self.acked = snapshot
+        for old in [t for t in self.sent if t <= tick]:
+            del self.sent[old]
+
+
+class Server:
+    def __init__(self, difficulty="Intermediate", seed=None, tick_rate=60):
+        self.difficulty = difficulty
+        self.seed = new_seed() if seed is None else seed
+        self.tick_rate = tick_rate
+        self.speed = DIFFICULTY_SETTINGS[difficulty]["obstacle_speed"]
+        self.games = {}  # player -> Game
+        self.inputs = {}  # player -> input bits
+        self.clients = []
+        self.next_player = 0
+        self.tick = 0
+        self.restart_at = None
+        self.encode_seconds = 0.0
+
+    def add_player(self):
+        player = self.next_player
+        self.next_player += 1
+        self.games[player] = Game(self.difficulty, seed=self.seed)
+        self.inputs[player] = 0
+        return player
+
+    async def handle_client(self, reader, writer):
+        client = None
+        try:
+            data = await read_message(reader)
+            if len(data) != JOIN_MESSAGE.size or data[0] != JOIN:
+                return
+            _, role, watch = JOIN_MESSAGE.unpack(data)
+            player = self.add_player() if role == ROLE_PLAYER else None
+            client = ClientConnection(writer, player, player if player is not None else watch)
+            hello = HELLO_MESSAGE.pack(HELLO, VERSION, DIFFICULTIES.index(self.difficulty), self.seed,
+                                       self.tick_rate, self.speed, SPECTATOR if player is None else player)
+            writer.write(frame(hello))
+            self.clients.append(client)
+
+            while True:
+                data = await read_message(reader)
+                if not data:
+                    continue
+                if data[0] == ACK and len(data) == ACK_MESSAGE.size:
+                    client.acknowledge(ACK_MESSAGE.unpack(data)[1])
+                elif data[0] == INPUT and len(data) == INPUT_MESSAGE.size and player is not None:
+                    self.inputs[player] = data[1]
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.error = "disconnected from the server"
+        except NetError as e:
+            self.error = str(e)
+        finally:
+            if client is not None:
+                self.clients.remove(client)
+                if client.player is not None:
+                    del self.games[client.player]
+                    del self.inputs[client.player]
+            writer.close()
+
+    def step(self):
+        self.tick += 1
+        for player, game in self.games.items():
+            bits = self.inputs[player]
+            game.tick(bits & LEFT, bits & RIGHT)
+
+        # Once every racer is out, start a new race on a fresh seed
+        if self.games and all(game.game_over for game in self.games.values()):
+            if self.restart_at is None:
+                self.restart_at = self.tick + RESTART_DELAY_TICKS
+            elif self.tick >= self.restart_at:
+                self.seed = new_seed()
+                for game in self.games.values():
+                    game.reset(self.seed)
+                self.restart_at = None
+
+    def broadcast(self):
+        start = time.perf_counter()
+        scoreboard = tuple((player, game.score, game.game_over) for player, game in self.games.items())
+        captured = {}
+        # Clients following the same game from the same baseline share one encoding
+        encoded = {}
+        for client in self.clients:
+            game = self.games.get(client.watch)
+            if game is None:
+                continue
+            transport = client.writer.transport
+            if transport.get_write_buffer_size() > SEND_BUFFER_LIMIT:
+                client.skipped += 1
+                continue
+            snapshot = captured.get(client.watch)
+            if snapshot is None:
+                snapshot = captured[client.watch] = capture(game, self.tick, scoreboard)
+            key = (client.watch, None if client.acked is None else client.acked.tick)
+            message = encoded.get(key)
+            if message is None:
+                message = encoded[key] = frame(encode_snapshot(snapshot, client.acked, self.speed))
+            client.writer.write(message)
+            client.bytes_sent += len(message)
+            client.snapshots_sent += 1
+            client.sent[snapshot.tick] = snapshot
+            if len(client.sent) > HISTORY:
+                del client.sent[min(client.sent)]
+        self.encode_seconds += time.perf_counter() - start
+
+    async def run(self, ticks=None):
+        """Tick at `tick_rate` (as fast as possible if 0) until `ticks` ticks have run"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while ticks is None or self.tick < ticks:
+            self.step()
+            self.broadcast()
+            if self.tick_rate:
+                next_tick += 1 / self.tick_rate
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            else:
+                await asyncio.sleep(0)
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+class Interpolator:
+    """Renders `delay` ticks behind the newest snapshot, blending the two around that time"""
+
+    def __init__(self, tick_rate, delay=INTERPOLATION_DELAY):
+        self.tick_rate = tick_rate
+        self.delay = delay
+        self.snapshots = deque(maxlen=32)
+        self.ticks = deque(maxlen=32)
+        self.received_at = 0.0
+
+    def push(self, snapshot, now):
+        if self.ticks and snapshot.tick <= self.ticks[-1]:
+            return
+        self.snapshots.append(snapshot)
+        self.ticks.append(snapshot.tick)
+        self.received_at = now
+
+    def render_tick(self, now):
+        newest = self.ticks[-1]
+        estimate = newest + (now - self.received_at) * self.tick_rate
+        # Keep advancing between arrivals; only the newest snapshot itself is a hard limit
+        return min(estimate - self.delay, newest)
+
+    def sample(self, now):
+        """(snapshot at or before the render time, player x, obstacle positions, bonus positions)"""
+        if not self.snapshots:
+            return None
+        render_tick = self.render_tick(now)
+        index = bisect.bisect_right(self.ticks, render_tick) - 1
+        if index < 0:
+            older = self.snapshots[0]
+            return older, older.player_x, *split_positions(older.entities, None, 0.0)
+        older = self.snapshots[index]
+        if index + 1 >= len(self.snapshots):
+            return older, older.player_x, *split_positions(older.entities, None, 0.0)
+        newer = self.snapshots[index + 1]
+        t = (render_tick - older.tick) / (newer.tick - older.tick)
+        player_x = round(older.player_x + (newer.player_x - older.player_x) * t)
+        return older, player_x, *split_positions(older.entities, newer.entities, t)
+
+
+def split_positions(entities, newer, t):
+    obstacles = []
+    bonuses = []
+    for entity_id, (kind, x, y) in entities.items():
+        if newer is not None:
+            target = newer.get(entity_id)
+            if target is not None:
+                y = round(y + (target[2] - y) * t)
+        (bonuses if kind == BONUS else obstacles).append((x, y))
+    return obstacles, bonuses
+
+
+class RemoteGame:
+    """Read-only stand-in for ``Game`` that ``GameRenderer`` can draw from interpolated snapshots"""
+
+    def __init__(self, difficulty, player):
+        self.difficulty = difficulty
+        self.player_id = player
+        self.score = 0
+        self.high_score = 0
+        self.game_over = False
+        self.new_high_score = False
+        self.game_over_selection = 0
+        self.scoreboard = ()
+        self.player_x = 0
+        self.player_y = Player().y
+        self.obstacles = []
+        self.bonuses = []
+
+    def update(self, interpolator, now):
+        sample = interpolator.sample(now)
+        if sample is None:
+            return
+        snapshot, self.player_x, self.obstacles, self.bonuses = sample
+        self.score = snapshot.score
+        self.game_over = snapshot.game_over
+        self.scoreboard = snapshot.scoreboard
+        self.high_score = max((score for _, score, _ in snapshot.scoreboard), default=0)
+
+    def player_position(self, alpha=1.0):
+        return self.player_x, self.player_y
+
+    def obstacle_positions(self, alpha=1.0):
+        return self.obstacles
+
+    def bonus_positions(self, alpha=1.0):
+        return self.bonuses
+
+
+class NetClient:
+    def __init__(self, role=ROLE_PLAYER, watch=0):
+        self.role = role
+        self.watch = watch
+        self.reader = None
+        self.writer = None
+        self.difficulty = None
+        self.seed = None
+        self.tick_rate = 60
+        self.speed = 0
+        self.player = None
+        self.baselines = {}
+        self.interpolator = None
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.input_bits = 0
+        self.error = None  # why receive() stopped
+
+    async def connect(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(frame(JOIN_MESSAGE.pack(JOIN, self.role, self.watch)))
+        data = await read_message(self.reader)
+        if len(data) != HELLO_MESSAGE.size or data[0] != HELLO:
+            raise NetError("server did not say hello")
+        _, version, difficulty, self.seed, self.tick_rate, self.speed, player = HELLO_MESSAGE.unpack(data)
+        if version != VERSION:
+            raise NetError(f"server speaks protocol version {version}, expected {VERSION}")
+        if difficulty >= len(DIFFICULTIES):
+            raise NetError(f"server sent unknown difficulty {difficulty}")
+        self.difficulty = DIFFICULTIES[difficulty]
+        self.player = None if player == SPECTATOR else player
+        self.interpolator = Interpolator(self.tick_rate)
+
+    async def receive(self):
+        """Decode snapshots, acknowledging each, until the server goes away or sends garbage"""
+        try:
+            while True:
+                data = await read_message(self.reader)
+                self.bytes_received += LENGTH.size + len(data)
+                if not data or data[0] != SNAPSHOT:
+                    continue
+                snapshot = decode_snapshot(data, self.baselines, self.speed)
+                self.snapshots_received += 1
+                self.baselines[snapshot.tick] = snapshot
+                if len(self.baselines) > HISTORY:
+                    del self.baselines[min(self.baselines)]
+                self.interpolator.push(snapshot, time.perf_counter())
+                self.writer.write(frame(ACK_MESSAGE.pack(ACK, snapshot.tick)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.error = "disconnected from the server"
+        except NetError as e:
+            self.error = str(e)
+
+    def send_input(self, left, right):
+        bits = (LEFT if left else 0) | (RIGHT if right else 0)
+        if bits != self.input_bits:
+            self.input_bits = bits
+            self.writer.write(frame(INPUT_MESSAGE.pack(INPUT, bits)))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def run_server(args):
+    server = Server(args.difficulty, args.seed, args.tick_rate)
+    listener = await server.start(args.host, args.port)
+    print(f"serving {args.difficulty} (seed {server.seed}) on {args.host}:{args.port}")
+    async with listener:
+        await server.run()
+
+
+async def run_client(args):
+    import pygame
+
+    from .constants import HUD_FONT, HUD_FONT_SMALL, RED, SCREEN_HEIGHT, SCREEN_WIDTH, WHITE
+    from .render import GameRenderer
+    from .text_cache import render_text
+
+    client = NetClient(ROLE_SPECTATOR if args.watch is not None else ROLE_PLAYER, args.watch or 0)
+    await client.connect(args.host, args.port)
+    receiver = asyncio.create_task(client.receive())
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    who = "spectating" if client.player is None else f"player {client.player}"
+    pygame.display.set_caption(f"Dodge Blocks! - {who}")
+    renderer = GameRenderer()
+    view = RemoteGame(client.difficulty, client.player)
+    loop = asyncio.get_running_loop()
+    next_frame = loop.time()
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    return client.error
+            if receiver.done():
+                # Leave the last frame up with the reason until the window is closed
+                text = render_text(None, HUD_FONT, client.error, RED)
+                screen.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+                pygame.display.flip()
+                await asyncio.sleep(0.1)
+                continue
+            if client.player is not None:
+                keys = pygame.key.get_pressed()
+                client.send_input(keys[pygame.K_LEFT] or keys[pygame.K_a], keys[pygame.K_RIGHT] or keys[pygame.K_d])
+
+            view.update(client.interpolator, time.perf_counter())
+            renderer.draw(screen, view)
+            # Draw race standings under the HUD
+            for row, (player, score, game_over) in enumerate(view.scoreboard):
+                label = f"P{player}: {score}" + (" (out)" if game_over else "")
+                text = render_text(None, HUD_FONT_SMALL, label, WHITE)
+                screen.blit(text, (10, 100 + row * 22))
+            pygame.display.flip()
+
+            # Sleep out the rest of a 60 Hz frame; only the work above counts against it
+            next_frame = max(next_frame + 1 / 60, loop.time())
+            await asyncio.sleep(next_frame - loop.time())
+    finally:
+        client.close()
+        pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Race or spectate Dodge Blocks over the local network.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    server_parser = sub.add_parser("server")
+    server_parser.add_argument("--difficulty", choices=list(DIFFICULTY_SETTINGS), default="Intermediate")
+    server_parser.add_argument("--seed", type=int)
+    server_parser.add_argument("--tick-rate", type=int, default=60)
+    client_parser = sub.add_parser("client")
+    client_parser.add_argument("--watch", type=int, metavar="PLAYER",
+                               help="spectate this player instead of joining the race")
+    for sub_parser in (server_parser, client_parser):
+        sub_parser.add_argument("--host", default="127.0.0.1")
+        sub_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    try:
+        error = asyncio.run(run_server(args) if args.mode == "server" else run_client(args))
+    except KeyboardInterrupt:
+        return 0
+    except (OSError, NetError) as e:
+        error = e
+    if error:
+        print(f"netplay: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
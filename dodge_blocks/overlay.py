@@ -0,0 +1,49 @@
+"""On-screen performance overlay for ``dodge_blocks.profiler``."""
+import pygame
+
+from .constants import BLACK, GREEN, HUD_FONT_SMALL, SCREEN_WIDTH, WHITE
+from .profiler import PHASES
+from .text_cache import render_text
+
+PANEL_WIDTH = 230
+LINE_HEIGHT = 18
+
+
+class PerfOverlay:
+    def __init__(self, refresh_frames=30):
+        self.visible = False
+        # Re-summarizing every frame would churn the text cache with new numbers
+        self.refresh_frames = refresh_frames
+        self.lines = []
+        self.refreshed_at = None
+        # Top right, below the pause button
+        self.rect = pygame.Rect(SCREEN_WIDTH - PANEL_WIDTH - 10, 60,
+                                PANEL_WIDTH, LINE_HEIGHT * (len(PHASES) + 4) + 8)
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.refreshed_at = None
+
+    def refresh(self, profiler):
+        stats = profiler.summary()
+        self.lines = [
+            f"FPS {stats['fps']:.0f}  entities {stats['entities']}",
+            f"frame {stats['mean_ms']:.2f} ms  p50 {stats['p50_ms']:.2f}",
+            f"p95 {stats['p95_ms']:.2f}  p99 {stats['p99_ms']:.2f} ms",
+        ]
+        self.lines += [f"{name}: {ms:.2f} ms" for name, ms in stats["phases_ms"].items()]
+        self.lines.append(f"input {stats['input_p50_ms']:.1f} ms  p99 {stats['input_p99_ms']:.1f}")
+        self.refreshed_at = profiler.frames
+
+    def draw(self, surface, profiler):
+        """Draw the panel and return its rect; the opaque backing keeps redraws idempotent"""
+        if self.refreshed_at is None or profiler.frames - self.refreshed_at >= self.refresh_frames:
+            self.refresh(profiler)
+
+        # 1px green border; fills rather than pygame.draw so texture renderers can draw it too
+        surface.fill(GREEN, self.rect)
+        surface.fill(BLACK, self.rect.inflate(-2, -2))
+        for i, line in enumerate(self.lines):
+            text = render_text(None, HUD_FONT_SMALL - 4, line, WHITE)
+            surface.blit(text, (self.rect.x + 6, self.rect.y + 4 + i * LINE_HEIGHT))
+        return self.rect
@@ -0,0 +1,80 @@
+"""Scripted input policies for headless play.
+
+A policy is a callable taking the ``Game`` and returning the (left, right)
+input for the next tick. They only read positions through the
+``*_positions`` methods, so they work with either entity store.
+"""
+import random
+
+from .constants import OBSTACLE_SIZE, SCREEN_WIDTH
+
+
+class IdlePolicy:
+    """Never moves"""
+
+    def __init__(self, seed=None):
+        pass
+
+    def __call__(self, game):
+        return False, False
+
+
+class RandomPolicy:
+    """Random walk that holds each choice for a few ticks, like a human tapping keys"""
+
+    def __init__(self, seed=None, hold=8):
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.remaining = 0
+        self.move = (False, False)
+
+    def __call__(self, game):
+        if self.remaining <= 0:
+            roll = self.rng.random()
+            self.move = (roll < 0.35, roll > 0.65)
+            self.remaining = self.rng.randint(1, self.hold)
+        self.remaining -= 1
+        return self.move
+
+
+class DodgePolicy:
+    """Steps sideways away from the nearest obstacle falling towards the player"""
+
+    def __init__(self, seed=None, lookahead=8):
+        self.lookahead = lookahead
+
+    def __call__(self, game):
+        player = game.player
+        reach = game.settings["obstacle_speed"] * self.lookahead
+        center = player.x + player.size / 2
+        threat = None
+        threat_y = None
+        for x, y in game.obstacle_positions():
+            # Only obstacles roughly in the player's column and about to land count
+            if y + OBSTACLE_SIZE < player.y - reach or y > player.y + player.size:
+                continue
+            if x + OBSTACLE_SIZE < player.x - player.speed * 2 or x > player.x + player.size + player.speed * 2:
+                continue
+            if threat_y is None or y > threat_y:
+                threat, threat_y = x + OBSTACLE_SIZE / 2, y
+        if threat is None:
+            return False, False
+
+        go_left = threat > center
+        # Walls: dodge the other way when there is no room on this side
+        if go_left and player.x <= player.speed:
+            go_left = False
+        elif not go_left and player.x >= SCREEN_WIDTH - player.size - player.speed:
+            go_left = True
+        return go_left, not go_left
+
+
+POLICIES = {
+    "idle": IdlePolicy,
+    "random": RandomPolicy,
+    "dodge": DodgePolicy,
+}
+
+
+def make_policy(name, seed=None):
+    return POLICIES[name](seed)
@@ -0,0 +1,139 @@
+"""Per-phase frame timing for the main loop.
+
+The loop calls ``begin_frame``, then ``mark(PHASE)`` as each phase finishes,
+then ``end_frame``. Each mark adds the time since the previous mark to that
+phase's slot for the current frame, in a fixed-size ring buffer of the most
+recent frames. ``end_frame`` also takes the frame's worst event-to-present
+input latency from ``dodge_blocks.input`` (0.0 when it showed no new input).
+``NullProfiler`` has the same interface and does nothing, so the loop can be
+instrumented unconditionally.
+"""
+import cProfile
+import csv
+import json
+import time
+from array import array
+
+from .stats import percentile
+
+EVENTS = 0
+INPUT = 1
+UPDATE = 2
+DRAW = 3
+PRESENT = 4
+WAIT = 5
+PHASES = ("events", "input", "update", "draw", "present", "wait")
+
+
+class NullProfiler:
+    enabled = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self, entities=0, input_latency=0.0):
+        pass
+
+
+class FrameProfiler:
+    enabled = True
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        # Seconds per phase, one row of len(PHASES) slots per frame
+        self.samples = array("d", [0.0]) * (capacity * len(PHASES))
+        self.entities = array("l", [0]) * capacity
+        self.input_latency = array("d", [0.0]) * capacity
+        self.frames = 0
+        self.row = 0
+        self.last = 0.0
+        self.in_frame = False
+        self.cprofile = None
+        self.cprofile_window = None
+
+    def begin_frame(self):
+        self.row = (self.frames % self.capacity) * len(PHASES)
+        for slot in range(self.row, self.row + len(PHASES)):
+            self.samples[slot] = 0.0
+        if self.cprofile_window is not None and self.frames == self.cprofile_window[0]:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        self.in_frame = True
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.samples[self.row + phase] += now - self.last
+        self.last = now
+
+    def end_frame(self, entities=0, input_latency=0.0):
+        self.entities[self.frames % self.capacity] = entities
+        self.input_latency[self.frames % self.capacity] = input_latency
+        self.frames += 1
+        self.in_frame = False
+        if self.cprofile is not None:
+            start, count, path = self.cprofile_window
+            if self.frames >= start + count:
+                self.cprofile.disable()
+                self.cprofile.dump_stats(path)
+                self.cprofile = None
+                self.cprofile_window = None
+
+    def profile_window(self, start, count, path):
+        """Run cProfile over frames [start, start + count) and dump the stats to `path`"""
+        self.cprofile_window = (start, count, path)
+
+    def rows(self):
+        """Yield (frame, entities, phase seconds..., input latency) for the buffered frames, oldest first"""
+        # A frame in progress has already cleared the oldest slot
+        stored = min(self.frames, self.capacity - self.in_frame)
+        for frame in range(self.frames - stored, self.frames):
+            index = frame % self.capacity
+            row = index * len(PHASES)
+            yield (frame, self.entities[index], *self.samples[row:row + len(PHASES)], self.input_latency[index])
+
+    def summary(self):
+        """FPS, frame-time and input-latency percentiles (ms) and mean ms per phase over the buffer"""
+        rows = list(self.rows())
+        if not rows:
+            return {"frames": 0, "fps": 0.0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0,
+                    "p99_ms": 0.0, "entities": 0, "phases_ms": dict.fromkeys(PHASES, 0.0),
+                    "input_frames": 0, "input_p50_ms": 0.0, "input_p99_ms": 0.0}
+        ordered = sorted(sum(row[2:2 + len(PHASES)]) * 1000 for row in rows)
+        mean = sum(ordered) / len(ordered)
+        # Only frames that showed new input have a latency
+        latencies = sorted(row[-1] * 1000 for row in rows if row[-1])
+        return {
+            "frames": len(rows),
+            "fps": 1000 / mean if mean else 0.0,
+            "mean_ms": mean,
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+            "entities": rows[-1][1],
+            "phases_ms": {name: sum(row[2 + i] for row in rows) * 1000 / len(rows)
+                          for i, name in enumerate(PHASES)},
+            "input_frames": len(latencies),
+            "input_p50_ms": percentile(latencies, 50),
+            "input_p99_ms": percentile(latencies, 99),
+        }
+
+    def export(self, path):
+        """Write the buffer to `path` as CSV if it ends in .csv, otherwise JSON"""
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(("frame", "entities", *(f"{name}_s" for name in PHASES), "input_latency_s"))
+                writer.writerows(self.rows())
+            return
+        data = {
+            "phases": PHASES,
+            "summary": self.summary(),
+            "frames": [{"frame": row[0], "entities": row[1], **dict(zip(PHASES, row[2:])), "input_latency": row[-1]}
+                       for row in self.rows()],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
@@ -0,0 +1,161 @@
+"""pygame rendering adapter for the simulation in ``dodge_blocks.simulation``."""
+import pygame
+
+from .constants import (
+    BLACK,
+    GRAY,
+    GREEN,
+    HUD_FONT,
+    HUD_FONT_SMALL,
+    ICON_SIZE,
+    LIGHT_BLUE,
+    RED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    WHITE,
+    YELLOW,
+)
+from .layers import Layer
+from .sprites import draw_bonus_circle, draw_obstacle, draw_player, get_atlas
+from .text_cache import render_text
+
+
+# Pause button in the top right, including its 5px frame
+PAUSE_ICON_SIZE = 30
+PAUSE_BUTTON_SIZE = PAUSE_ICON_SIZE + 10
+PAUSE_BUTTON_POS = (SCREEN_WIDTH - PAUSE_ICON_SIZE - 15, 5)
+
+# Restart and exit icons on the game-over screen, side by side
+GAME_OVER_ICON_SPACING = 120
+# The game-over text, icons and hint, from the title down to the bottom of the screen
+GAME_OVER_TOP = SCREEN_HEIGHT//2 - 100
+GAME_OVER_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT - GAME_OVER_TOP)
+
+
+class GameRenderer:
+    def __init__(self, use_sprites=True):
+        self.use_sprites = use_sprites
+        self.pause_button = Layer((PAUSE_BUTTON_SIZE, PAUSE_BUTTON_SIZE), self.paint_pause_button, opaque=True)
+        # The whole game-over block, repainted only when its score or selection changes
+        self.game_over = Layer(GAME_OVER_SIZE, self.paint_game_over, alpha=True)
+
+    def draw_entities(self, surface, game, alpha=1.0):
+        """Draw the entities `alpha` of the way from the previous tick to the current one"""
+        if game.game_over:
+            alpha = 1.0
+        if self.use_sprites:
+            atlas = get_atlas()
+            atlas.blit(surface, "player", game.player_position(alpha))
+            atlas.blit_many(surface, "obstacle", game.obstacle_positions(alpha))
+            atlas.blit_many(surface, "bonus", game.bonus_positions(alpha))
+            return
+
+        # Draw player
+        draw_player(surface, *game.player_position(alpha))
+
+        # Draw obstacles
+        for x, y in game.obstacle_positions(alpha):
+            draw_obstacle(surface, x, y)
+
+        # Draw bonus circles
+        for x, y in game.bonus_positions(alpha):
+            draw_bonus_circle(surface, x, y)
+
+    def draw(self, surface, game, alpha=1.0):
+        surface.fill(BLACK)
+        self.draw_entities(surface, game, alpha)
+        self.draw_hud(surface, game)
+        self.draw_pause_button(surface)
+
+        # Draw game over screen
+        if game.game_over:
+            self.draw_game_over(surface, game)
+
+    def draw_hud(self, surface, game):
+        """Draw score, difficulty, and high score, returning the rects drawn"""
+        score_text = render_text(None, HUD_FONT, f"Score: {game.score}", WHITE)
+        difficulty_text = render_text(None, HUD_FONT_SMALL, f"Difficulty: {game.difficulty}", GRAY)
+        high_score_text = render_text(None, HUD_FONT_SMALL, f"High Score: {game.high_score}", YELLOW)
+        return [
+            surface.blit(score_text, (10, 10)),
+            surface.blit(difficulty_text, (10, 40)),
+            surface.blit(high_score_text, (10, 70)),
+        ]
+
+    def draw_pause_button(self, surface):
+        return self.pause_button.blit(surface, PAUSE_BUTTON_POS)
+
+    def paint_pause_button(self, surface, key):
+        # Draw pause icon, offset by its 5px frame
+        pause_icon_size = PAUSE_ICON_SIZE
+        pause_x = 5
+        pause_y = 5
+
+        # Draw pause icon background
+        pygame.draw.rect(surface, LIGHT_BLUE, (pause_x - 5, pause_y - 5, pause_icon_size + 10, pause_icon_size + 10))
+        pygame.draw.rect(surface, BLACK, (pause_x - 3, pause_y - 3, pause_icon_size + 6, pause_icon_size + 6))
+
+        # Draw pause bars
+        bar_width = 4
+        bar_height = 20
+        bar_spacing = 6
+
+        pygame.draw.rect(surface, WHITE, (pause_x + bar_spacing, pause_y + 5, bar_width, bar_height))
+        pygame.draw.rect(surface, WHITE, (pause_x + pause_icon_size - bar_spacing - bar_width, pause_y + 5, bar_width, bar_height))
+
+    def draw_game_over(self, surface, game):
+        key = (game.score, game.high_score, game.new_high_score, game.game_over_selection)
+        return self.game_over.blit(surface, (0, GAME_OVER_TOP), key)
+
+    def paint_game_over(self, surface, key):
+        score, _, new_high_score, selection = key
+        # Painted at block-local coordinates, GAME_OVER_TOP above the screen's
+        top = -GAME_OVER_TOP
+        game_over_text = render_text(None, HUD_FONT, "GAME OVER!", RED)
+        final_score_text = render_text(None, HUD_FONT, f"Final Score: {score}", GREEN)
+
+        surface.blit(game_over_text, (SCREEN_WIDTH//2 - game_over_text.get_width()//2, top + SCREEN_HEIGHT//2 - 100))
+        surface.blit(final_score_text, (SCREEN_WIDTH//2 - final_score_text.get_width()//2, top + SCREEN_HEIGHT//2 - 60))
+
+        # Show new high score message if achieved
+        if new_high_score:
+            new_high_score_text = render_text(None, HUD_FONT, "NEW HIGH SCORE!", YELLOW)
+            surface.blit(new_high_score_text, (SCREEN_WIDTH//2 - new_high_score_text.get_width()//2, top + SCREEN_HEIGHT//2 - 20))
+
+        # Draw restart and exit icons
+        icon_x = SCREEN_WIDTH//2 - ICON_SIZE//2
+        icon_y = top + SCREEN_HEIGHT//2 + 20
+        spacing = GAME_OVER_ICON_SPACING
+
+        # Restart icon
+        restart_x = icon_x - spacing//2
+        restart_color = GREEN if selection == 0 else WHITE
+        pygame.draw.circle(surface, restart_color, (restart_x + ICON_SIZE//2, icon_y + ICON_SIZE//2), ICON_SIZE//3, 3)
+        arrow_points = [
+            (restart_x + ICON_SIZE//2 + 8, icon_y + ICON_SIZE//2 - 8),
+            (restart_x + ICON_SIZE//2 + 16, icon_y + ICON_SIZE//2 - 8),
+            (restart_x + ICON_SIZE//2 + 12, icon_y + ICON_SIZE//2 - 16)
+        ]
+        pygame.draw.polygon(surface, restart_color, arrow_points)
+
+        # Exit icon
+        exit_x = icon_x + spacing//2
+        exit_color = GREEN if selection == 1 else WHITE
+        margin = ICON_SIZE // 4
+        pygame.draw.line(surface, exit_color, (exit_x + margin, icon_y + margin), (exit_x + ICON_SIZE - margin, icon_y + ICON_SIZE - margin), 4)
+        pygame.draw.line(surface, exit_color, (exit_x + ICON_SIZE - margin, icon_y + margin), (exit_x + margin, icon_y + ICON_SIZE - margin), 4)
+
+        # Restart label
+        restart_text = render_text(None, HUD_FONT_SMALL, "Restart", restart_color)
+        restart_text_rect = restart_text.get_rect(center=(restart_x + ICON_SIZE//2, icon_y + ICON_SIZE + 15))
+        surface.blit(restart_text, restart_text_rect)
+
+        # Exit label
+        exit_text = render_text(None, HUD_FONT_SMALL, "Exit", exit_color)
+        exit_text_rect = exit_text.get_rect(center=(exit_x + ICON_SIZE//2, icon_y + ICON_SIZE + 15))
+        surface.blit(exit_text, exit_text_rect)
+
+        # Draw navigation hint
+        hint_text = render_text(None, HUD_FONT_SMALL, "Use ← → arrows to navigate, ENTER to select, R to rewind", GRAY)
+        hint_rect = hint_text.get_rect(center=(SCREEN_WIDTH//2, top + SCREEN_HEIGHT - 50))
+        surface.blit(hint_text, hint_rect)
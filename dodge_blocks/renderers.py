@@ -0,0 +1,160 @@
+"""Display backends: the software surface path and SDL2 hardware textures.
+
+Both backends offer the same small interface: ``game_frame`` and
+``canvas_frame`` return the target to draw the next frame on, ``target`` is
+the one drawn on last (where the overlay goes), ``frame_surface`` gives the
+game frame as a software surface, and ``present`` shows the frame. The
+targets support the part of the ``Surface`` API that the screen code uses
+(``fill``, ``blit`` and ``blits``), so the screens draw the same way on
+either backend:
+
+* ``SoftwareRenderer`` draws into the display surface with ``pygame.draw`` and
+  ``blit`` as before. For a window other than 800x600 it asks for a
+  ``pygame.SCALED`` display, so SDL stretches the logical frame on present.
+* ``TextureRenderer`` owns a ``pygame._sdl2.video`` window and renderer. The
+  sprite atlas and every text or layer surface are uploaded once as textures
+  and drawn as textured copies, so a game frame touches no pixels on the CPU.
+  It also stands in for a ``Surface`` (``fill``, ``blit``, ``blits``), which
+  lets ``GameRenderer`` and the overlay draw to it unchanged.
+
+Both render at the logical ``SCREEN_WIDTH`` x ``SCREEN_HEIGHT`` and scale to
+the window on the GPU. Menus and the pause screen are still composed in
+software on ``canvas``; the texture backend uploads the canvas whenever such
+a frame is presented, which only happens when they change.
+"""
+from collections import OrderedDict
+
+import pygame
+
+from .constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+CAPTION = "Dodge Blocks!"
+LOGICAL_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+
+class SoftwareRenderer:
+    name = "software"
+    # Whatever was drawn stays on the surface, so frames may redraw only what changed
+    retained = True
+
+    def __init__(self, window_size=None):
+        scaled = window_size is not None and tuple(window_size) != LOGICAL_SIZE
+        flags = pygame.SCALED | pygame.RESIZABLE if scaled else 0
+        self.screen = pygame.display.set_mode(LOGICAL_SIZE, flags)
+        if scaled:
+            from pygame._sdl2.video import Window
+            Window.from_display_module().size = window_size
+        pygame.display.set_caption(CAPTION)
+        self.canvas = self.screen
+        self.target = self.screen
+
+    def game_frame(self):
+        return self.screen
+
+    def canvas_frame(self):
+        return self.screen
+
+    def frame_surface(self, draw):
+        """The game frame as a surface, drawn again so nothing laid over it (the overlay) comes along"""
+        draw(self.screen)
+        return self.screen
+
+    def present(self, rects=None):
+        """Flip the whole frame, or only `rects`; an empty list presents nothing"""
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+
+class TextureRenderer:
+    name = "texture"
+    # Every presented frame is drawn from scratch
+    retained = False
+
+    def __init__(self, window_size=None, max_textures=512):
+        from pygame._sdl2.video import Renderer, Texture, Window
+
+        self.texture_class = Texture
+        self.window = Window(CAPTION, size=window_size or LOGICAL_SIZE)
+        self.renderer = Renderer(self.window)
+        self.renderer.logical_size = LOGICAL_SIZE
+        self.canvas = pygame.Surface(LOGICAL_SIZE)
+        self.canvas_texture = None
+        self.from_canvas = False
+        # Source surface id -> (surface, texture); holding the surface keeps its id from being reused
+        self.textures = OrderedDict()
+        self.max_textures = max_textures
+        self.uploads = 0
+
+    @property
+    def target(self):
+        return self.canvas if self.from_canvas else self
+
+    def game_frame(self):
+        self.from_canvas = False
+        return self
+
+    def canvas_frame(self):
+        self.from_canvas = True
+        return self.canvas
+
+    def frame_surface(self, draw):
+        """Draw the frame again in software, for screens that need it as a surface"""
+        draw(self.canvas)
+        return self.canvas
+
+    def texture(self, surface):
+        """The texture for `surface`, uploading it the first time it is drawn"""
+        key = id(surface)
+        entry = self.textures.get(key)
+        if entry is not None and entry[0] is surface:
+            self.textures.move_to_end(key)
+            return entry[1]
+        texture = self.texture_class.from_surface(self.renderer, surface)
+        self.textures[key] = (surface, texture)
+        self.uploads += 1
+        if len(self.textures) > self.max_textures:
+            self.textures.popitem(last=False)
+        return texture
+
+    def fill(self, color, rect=None):
+        self.renderer.draw_color = pygame.Color(color)
+        if rect is None:
+            self.renderer.clear()
+            return pygame.Rect((0, 0), LOGICAL_SIZE)
+        rect = pygame.Rect(rect)
+        self.renderer.fill_rect(rect)
+        return rect
+
+    def blit(self, source, dest, area=None):
+        if area is None:
+            area = source.get_rect()
+        rect = pygame.Rect(dest[0], dest[1], area[2], area[3])
+        self.texture(source).draw(srcrect=area, dstrect=rect)
+        return rect
+
+    def blits(self, sequence, doreturn=True):
+        rects = [self.blit(*item) for item in sequence]
+        return rects if doreturn else None
+
+    def present(self, rects=None):
+        """Show the frame; an empty `rects` list means nothing changed"""
+        if rects is not None and not rects:
+            return
+        if self.from_canvas:
+            if self.canvas_texture is None:
+                self.canvas_texture = self.texture_class(self.renderer, LOGICAL_SIZE, streaming=True)
+            self.canvas_texture.update(self.canvas)
+            self.canvas_texture.draw()
+        self.renderer.present()
+
+
+RENDERERS = {
+    "software": SoftwareRenderer,
+    "texture": TextureRenderer,
+}
+
+
+def make_renderer(name, window_size=None):
+    return RENDERERS[name](window_size)
@@ -0,0 +1,199 @@
+"""Compact binary input recordings and headless replay verification.
+
+A recording is the game's seed plus the input for every simulated tick. Each
+tick's input is three bits (left, right, pause) and consecutive identical
+ticks are run-length encoded, so a typical game takes a few hundred bytes.
+
+File layout (little endian)::
+
+    magic      4s   b"DBRP"
+    version    B
+    difficulty B    index into DIFFICULTY_SETTINGS
+    seed       Q
+    ticks      I    number of simulated ticks
+    score      I    final score claimed by the recorder
+    runs       ...  varint((run_length << 3) | bits) until end of file
+
+Run ``python -m dodge_blocks.replay FILE...`` to re-simulate recordings and
+check their final scores.
+"""
+import argparse
+import struct
+import sys
+import time
+
+from .constants import DIFFICULTY_SETTINGS
+from .simulation import Game
+
+MAGIC = b"DBRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBBQII")
+
+LEFT = 1
+RIGHT = 2
+PAUSE = 4
+
+DIFFICULTIES = list(DIFFICULTY_SETTINGS)
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def pack_input(left, right, pause=False):
+    return (LEFT if left else 0) | (RIGHT if right else 0) | (PAUSE if pause else 0)
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated run")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recording:
+    def __init__(self, difficulty, seed, runs=None, score=0):
+        self.difficulty = difficulty
+        self.seed = seed
+        self.runs = runs if runs is not None else []  # [bits, count] pairs
+        self.score = score
+
+    @property
+    def ticks(self):
+        return sum(count for _, count in self.runs)
+
+    def inputs(self):
+        """Yield the packed input bits for every tick in order"""
+        for bits, count in self.runs:
+            for _ in range(count):
+                yield bits
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, DIFFICULTIES.index(self.difficulty),
+                                    self.seed, self.ticks, self.score))
+        for bits, count in self.runs:
+            write_varint(out, (count << 3) | bits)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ReplayError("file too short for a replay header")
+        magic, version, difficulty, seed, ticks, score = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a Dodge Blocks replay")
+        if version != VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+        if difficulty >= len(DIFFICULTIES):
+            raise ReplayError(f"unknown difficulty index {difficulty}")
+
+        runs = []
+        pos = HEADER.size
+        while pos < len(data):
+            value, pos = read_varint(data, pos)
+            runs.append([value & 0x7, value >> 3])
+        recording = cls(DIFFICULTIES[difficulty], seed, runs, score)
+        if recording.ticks != ticks:
+            raise ReplayError(f"header says {ticks} ticks but runs hold {recording.ticks}")
+        return recording
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class InputRecorder:
+    """Collects per-tick input for one game into a ``Recording``"""
+
+    def __init__(self, game):
+        self.recording = Recording(game.difficulty, game.seed)
+        self.pause_pending = False
+
+    def mark_pause(self):
+        # Pausing doesn't change the simulation; the bit lands on the next tick
+        self.pause_pending = True
+
+    def record(self, left, right):
+        bits = pack_input(left, right, self.pause_pending)
+        self.pause_pending = False
+        runs = self.recording.runs
+        if runs and runs[-1][0] == bits:
+            runs[-1][1] += 1
+        else:
+            runs.append([bits, 1])
+
+    def truncate(self, ticks):
+        """Keep only the first `ticks` ticks, e.g. after the game was rewound"""
+        runs = self.recording.runs
+        kept = 0
+        for i, run in enumerate(runs):
+            if kept + run[1] >= ticks:
+                run[1] = ticks - kept
+                del runs[i + 1 if run[1] else i:]
+                return
+            kept += run[1]
+
+    def finish(self, score):
+        self.recording.score = score
+        return self.recording
+
+
+def replay(recording, game_cls=Game):
+    """Re-simulate a recording headlessly and return the finished game"""
+    game = game_cls(recording.difficulty, seed=recording.seed)
+    for bits in recording.inputs():
+        game.tick(bits & LEFT, bits & RIGHT)
+    return game
+
+
+def verify(recording, game_cls=Game):
+    """Replay a recording; returns (matches, replayed score, seconds taken)"""
+    start = time.perf_counter()
+    game = replay(recording, game_cls)
+    elapsed = time.perf_counter() - start
+    return game.score == recording.score, game.score, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify Dodge Blocks replays by re-simulating them.")
+    parser.add_argument("replays", nargs="+")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.replays:
+        try:
+            recording = Recording.load(path)
+        except (OSError, ReplayError) as e:
+            print(f"{path}: {e}")
+            failed += 1
+            continue
+        ok, score, elapsed = verify(recording)
+        rate = recording.ticks / elapsed if elapsed else float("inf")
+        status = "OK" if ok else f"MISMATCH (recorded {recording.score})"
+        print(f"{path}: {recording.difficulty}, {recording.ticks} ticks, score {score} {status} "
+              f"[{rate:,.0f} ticks/s]")
+        failed += not ok
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
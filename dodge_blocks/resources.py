@@ -0,0 +1,59 @@
+"""Process-wide registry of loaded pygame resources.
+
+Every font is loaded once per (face, size) and shared by all screens, and
+other expensive resources (the sprite atlas) are built by their loader on
+first request. The pygame subsystem a resource needs is initialized at that
+point too, so nothing is loaded or initialized before something draws.
+"""
+import time
+
+import pygame
+
+
+class ResourceRegistry:
+    def __init__(self):
+        self.fonts = {}
+        self.resources = {}
+        self.load_seconds = 0.0
+
+    def font(self, face, size):
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            start = time.perf_counter()
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(face, size)
+            self.fonts[key] = font
+            self.load_seconds += time.perf_counter() - start
+        return font
+
+    def get(self, name, loader):
+        """Return the resource called `name`, calling `loader()` to build it the first time"""
+        resource = self.resources.get(name)
+        if resource is None:
+            start = time.perf_counter()
+            resource = loader()
+            self.resources[name] = resource
+            self.load_seconds += time.perf_counter() - start
+        return resource
+
+    def stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "resources": len(self.resources),
+            "load_seconds": self.load_seconds,
+        }
+
+    def clear(self):
+        self.fonts.clear()
+        self.resources.clear()
+        self.load_seconds = 0.0
+
+
+registry = ResourceRegistry()
+
+
+def get_font(face, size):
+    """Load a font through the shared registry"""
+    return registry.font(face, size)
@@ -0,0 +1,250 @@
+"""Memory-bounded rewind history built from compact game-state keyframes.
+
+A keyframe is the complete state of a ``Game`` in a fixed little-endian
+layout: a header with the player, counters and score, the 625-word Mersenne
+Twister state of the game's generator, then id/x/y/speed columns for the
+live obstacles and bonus circles::
+
+    header     KEYFRAME_HEADER (see below)
+    rng        625 x uint32
+    obstacles  ids, xs, ys, speeds   int32 x count each
+    bonuses    ids, xs, ys, speeds   int32 x count each
+
+The simulation is deterministic given that state, so the deltas between
+keyframes are just one input byte per tick. ``RewindBuffer`` writes keyframes
+and their input bytes one after another into a single preallocated arena
+that wraps around, dropping the oldest history once the memory cap is
+reached. Restoring a tick loads the nearest keyframe before it and
+re-simulates forward from there.
+
+A keyframe is written every ``keyframe_interval`` ticks, or sooner once the
+ticks since the last one took ``replay_budget`` seconds to simulate, so a
+restore never replays more than that. ``step`` times each tick for this. In
+ordinary play a keyframe lands every half second. With thousands of object
+entities, where a single tick outlasts the budget, every tick gets one and a
+restore is only the keyframe load.
+"""
+import struct
+import time
+from array import array
+from collections import deque
+
+from .replay import LEFT, RIGHT, pack_input
+
+# tick, player x, player previous x, score, high score, spawn counter,
+# bonus spawn counter, next entity id, gauss_next, flags, obstacle count, bonus count
+KEYFRAME_HEADER = struct.Struct("<IiiIIiiIdBII")
+SPAWN_COUNTER_FIELD = 5
+RNG_WORDS = 625
+RNG_SIZE = RNG_WORDS * 4
+COLUMNS = 4
+
+FLAG_GAME_OVER = 1
+FLAG_NEW_HIGH_SCORE = 2
+FLAG_GAUSS = 4
+
+DEFAULT_CAPACITY = 4 * 1024 * 1024
+# Room for a keyframe with a few thousand live entities
+MIN_CAPACITY = 64 * 1024
+
+
+def keyframe_size(obstacles, bonuses):
+    return KEYFRAME_HEADER.size + RNG_SIZE + 4 * COLUMNS * (obstacles + bonuses)
+
+
+def write_keyframe(game, tick, out, pos):
+    """Serialize `game` into `out` at `pos`; returns the end offset"""
+    obstacle_columns, bonus_columns = game.entity_columns()
+    obstacles = len(obstacle_columns[0])
+    bonuses = len(bonus_columns[0])
+    version, words, gauss = game.rng.getstate()
+    flags = ((FLAG_GAME_OVER if game.game_over else 0) | (FLAG_NEW_HIGH_SCORE if game.new_high_score else 0) |
+             (FLAG_GAUSS if gauss is not None else 0))
+    player = game.player
+    KEYFRAME_HEADER.pack_into(out, pos, tick, player.x, player.prev_x, game.score, game.high_score,
+                              game.spawn_counter, game.bonus_spawn_counter, game.next_entity_id,
+                              gauss or 0.0, flags, obstacles, bonuses)
+    pos += KEYFRAME_HEADER.size
+    out[pos:pos + RNG_SIZE] = array("I", words)
+    pos += RNG_SIZE
+    for columns in (obstacle_columns, bonus_columns):
+        for column in columns:
+            data = memoryview(column).cast("B")
+            out[pos:pos + len(data)] = data
+            pos += len(data)
+    return pos
+
+
+def read_keyframe(game, data, pos=0):
+    """Load the keyframe at `pos` into `game`; returns its tick"""
+    (tick, player_x, prev_x, score, high_score, spawn_counter, bonus_spawn_counter, next_entity_id,
+     gauss, flags, obstacles, bonuses) = KEYFRAME_HEADER.unpack_from(data, pos)
+    pos += KEYFRAME_HEADER.size
+    words = tuple(memoryview(data)[pos:pos + RNG_SIZE].cast("I"))
+    game.rng.setstate((3, words, gauss if flags & FLAG_GAUSS else None))
+    pos += RNG_SIZE
+
+    columns = []
+    for count in (obstacles, bonuses):
+        size = 4 * count
+        columns.append([memoryview(data)[pos + i * size:pos + (i + 1) * size].cast("i") for i in range(COLUMNS)])
+        pos += COLUMNS * size
+    game.load_entity_columns(*columns)
+
+    game.player.x = player_x
+    game.player.prev_x = prev_x
+    game.score = score
+    game.high_score = high_score
+    game.spawn_counter = spawn_counter
+    game.bonus_spawn_counter = bonus_spawn_counter
+    game.next_entity_id = next_entity_id
+    game.game_over = bool(flags & FLAG_GAME_OVER)
+    game.new_high_score = bool(flags & FLAG_NEW_HIGH_SCORE)
+    game.game_over_selection = 0
+    return tick
+
+
+class Record:
+    """One keyframe in the arena and the input bytes that follow it"""
+
+    __slots__ = ("tick", "start", "size", "inputs")
+
+    def __init__(self, tick, start, size):
+        self.tick = tick
+        self.start = start
+        self.size = size
+        self.inputs = 0
+
+    @property
+    def end(self):
+        return self.start + self.size + self.inputs
+
+
+class RewindBuffer:
+    def __init__(self, capacity=DEFAULT_CAPACITY, keyframe_interval=30, replay_budget=0.001):
+        """`replay_budget` caps the seconds of simulation a restore replays after its keyframe"""
+        self.arena = bytearray(capacity)
+        self.keyframe_interval = keyframe_interval
+        self.replay_budget = replay_budget
+        self.records = deque()
+        self.write_pos = 0
+        self.tick = 0
+        self.start_state = None
+        self.keyframes = 0
+        # Time the ticks recorded since the last keyframe took to simulate
+        self.replay_cost = 0.0
+        # Whether the current run has been rewound since it started
+        self.rewound = False
+
+    def start(self, game):
+        """Forget all history and begin recording `game` from its current state"""
+        self.records.clear()
+        self.write_pos = 0
+        self.tick = 0
+        self.rewound = False
+        self.write(game)
+        first = self.records[0]
+        # Kept outside the arena so a restart never depends on what was evicted
+        self.start_state = bytes(self.arena[first.start:first.end])
+
+    def reserve(self, size):
+        """Find room for `size` bytes at the write position, evicting the oldest history it overlaps"""
+        if size > len(self.arena):
+            raise ValueError(f"a {size}-byte keyframe does not fit a {len(self.arena)}-byte rewind buffer")
+        records = self.records
+        start = self.write_pos
+        if start + size > len(self.arena):
+            # Wrap to the front; whatever lies past the write position is the oldest history
+            while records and records[0].start >= start:
+                records.popleft()
+            start = 0
+        # Going forward from the write position, records are met oldest first
+        end = start + size
+        while records and records[0].start < end and start < records[0].end:
+            records.popleft()
+        return start
+
+    def write(self, game):
+        size = keyframe_size(len(game.obstacles), len(game.bonus_circles))
+        start = self.reserve(size)
+        self.write_pos = write_keyframe(game, self.tick, self.arena, start)
+        self.records.append(Record(self.tick, start, size))
+        self.keyframes += 1
+        self.replay_cost = 0.0
+        if game.waves is not None:
+            # The spawn counter is the wave clock; replaying from the oldest
+            # keyframe re-reads only the waves after it
+            oldest = KEYFRAME_HEADER.unpack_from(self.arena, self.records[0].start)
+            game.waves.rewind_horizon = oldest[SPAWN_COUNTER_FIELD]
+
+    def step(self, game, left, right):
+        """Tick `game` with this input and record it"""
+        start = time.perf_counter()
+        game.tick(left, right)
+        self.record(game, left, right, time.perf_counter() - start)
+
+    def record(self, game, left, right, cost=0.0):
+        """Call after each tick of `game` with the input it was given and the seconds the tick took"""
+        self.tick += 1
+        current = self.records[-1]
+        due = current.inputs + 1 >= self.keyframe_interval or self.replay_cost + cost >= self.replay_budget
+        if due or self.write_pos + 1 > len(self.arena):
+            self.write(game)
+            return
+        start = self.reserve(1)
+        self.arena[start] = pack_input(left, right)
+        current.inputs += 1
+        self.write_pos = start + 1
+        self.replay_cost += cost
+
+    @property
+    def oldest_tick(self):
+        return self.records[0].tick if self.records else self.tick
+
+    def restore(self, game, tick):
+        """Put `game` back at `tick` (clamped to the history held) and drop the history after it"""
+        tick = max(self.oldest_tick, min(tick, self.tick))
+        while self.records[-1].tick > tick:
+            self.records.pop()
+        current = self.records[-1]
+        read_keyframe(game, self.arena, current.start)
+        inputs = tick - current.tick
+        replay_start = current.start + current.size
+        start = time.perf_counter()
+        for bits in self.arena[replay_start:replay_start + inputs]:
+            game.tick(bits & LEFT, bits & RIGHT)
+        # The replayed ticks are the ones a later restore from this keyframe replays again
+        self.replay_cost = time.perf_counter() - start
+        current.inputs = inputs
+        self.write_pos = replay_start + inputs
+        self.tick = tick
+        self.rewound = True
+        return tick
+
+    def rewind(self, game, ticks):
+        """Step `game` back up to `ticks` ticks; returns the tick it landed on"""
+        return self.restore(game, self.tick - ticks)
+
+    def restart(self, game, seed=None):
+        """Put `game` back at the state `start` recorded, as a new run that keeps its high score.
+
+        The new run spawns from `seed`, or from a fresh random seed if None,
+        so that it does not repeat the last layout unless asked to.
+        """
+        high_score = game.high_score
+        read_keyframe(game, self.start_state)
+        game.high_score = high_score
+        game.reseed(seed)
+        self.start(game)
+
+    def stats(self):
+        used = sum(record.size + record.inputs for record in self.records)
+        return {
+            "capacity": len(self.arena),
+            "used": used,
+            "records": len(self.records),
+            "oldest_tick": self.oldest_tick,
+            "tick": self.tick,
+            "span_ticks": self.tick - self.oldest_tick,
+            "keyframes_written": self.keyframes,
+        }
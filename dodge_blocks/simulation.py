@@ -0,0 +1,311 @@
+"""Pure-logic game simulation.
+
+Nothing in here imports pygame: the renderer in ``dodge_blocks.render`` reads
+the state of a ``Game`` and draws it, and the frontend feeds player input in
+through ``Player.move`` (or ``Game.tick``).
+"""
+import random
+from array import array
+
+from .collision import BroadPhase, sweep_aabb, sweep_circle_aabb
+from .constants import (
+    BONUS_RADIUS,
+    DIFFICULTY_SETTINGS,
+    OBSTACLE_SIZE,
+    PLAYER_SIZE,
+    PLAYER_SPEED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+from .pool import Pool
+from .waves import WaveScheduler
+
+
+class Player:
+    __slots__ = ("x", "prev_x", "y", "size", "speed")
+
+    def __init__(self):
+        self.x = SCREEN_WIDTH // 2
+        self.prev_x = self.x  # position at the start of the last tick, for interpolation
+        self.y = SCREEN_HEIGHT - 50
+        self.size = PLAYER_SIZE
+        self.speed = PLAYER_SPEED
+
+    def move(self, direction):
+        if direction == "left" and self.x > 0:
+            self.x -= self.speed
+        if direction == "right" and self.x < SCREEN_WIDTH - self.size:
+            self.x += self.speed
+
+
+class Obstacle:
+    __slots__ = ("id", "x", "y", "size", "speed")
+
+    def __init__(self, x, speed, entity_id=0):
+        self.reset(x, speed, entity_id)
+
+    def reset(self, x, speed, entity_id=0):
+        self.id = entity_id
+        self.x = x
+        self.y = -OBSTACLE_SIZE
+        self.size = OBSTACLE_SIZE
+        self.speed = speed
+
+    def move(self):
+        self.y += self.speed
+
+    def is_off_screen(self):
+        return self.y > SCREEN_HEIGHT
+
+    def sweep_bounds(self):
+        # Everything the obstacle covered while falling this tick
+        return self.x, self.y - self.speed, self.size, self.size + self.speed
+
+    def collides_with(self, player):
+        # Sweep from the start of the tick so fast obstacles can't tunnel through
+        return sweep_aabb(self.x, self.y - self.speed, self.size, self.size, 0, self.speed,
+                          player.x, player.y, player.size, player.size)
+
+
+class BonusCircle:
+    __slots__ = ("id", "x", "y", "radius", "speed", "collected")
+
+    def __init__(self, x, speed, entity_id=0):
+        self.reset(x, speed, entity_id)
+
+    def reset(self, x, speed, entity_id=0):
+        self.id = entity_id
+        self.x = x
+        self.y = -2 * BONUS_RADIUS
+        self.radius = BONUS_RADIUS
+        self.speed = speed
+        self.collected = False
+
+    def move(self):
+        self.y += self.speed
+
+    def is_off_screen(self):
+        return self.y > SCREEN_HEIGHT
+
+    def sweep_bounds(self):
+        size = 2 * self.radius
+        return self.x, self.y - self.speed, size, size + self.speed
+
+    def collides_with(self, player):
+        if self.collected:
+            return False
+        # Sweep the circle center along this tick's fall against the player box
+        center_x = self.x + self.radius
+        start_y = self.y + self.radius - self.speed
+        return sweep_circle_aabb(center_x, start_y, self.radius, 0, self.speed,
+                                 player.x, player.y, player.size, player.size)
+
+
+def new_seed():
+    return random.getrandbits(64)
+
+
+class Game:
+    def __init__(self, difficulty="Intermediate", high_score=0, seed=None, settings=None, waves=False):
+        # Every spawn draws from this game's own generator, so a seed and the
+        # per-tick input are enough to reproduce a run exactly
+        self.seed = new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.player = Player()
+        self.obstacles = []
+        self.bonus_circles = []
+        self.score = 0
+        self.game_over = False
+        self.spawn_counter = 0
+        self.bonus_spawn_counter = 0
+        self.game_over_selection = 0  # 0 for restart, 1 for exit
+        self.difficulty = difficulty
+        # Custom settings (used by the batch tuner) override the named difficulty
+        self.settings = settings if settings is not None else DIFFICULTY_SETTINGS[difficulty]
+        self.high_score = high_score
+        self.new_high_score = False
+        self.broad_phase = BroadPhase()
+        # Removed entities go back to these and are reused by the next spawns
+        self.obstacle_pool = Pool(Obstacle)
+        self.bonus_pool = Pool(BonusCircle)
+        # Spawned entities are numbered so snapshots can be diffed by identity;
+        # the counter keeps running across resets
+        self.next_entity_id = 1
+        # Obstacles come from verified wave patterns instead of the spawn timer
+        self.waves = WaveScheduler(self.seed, self.settings) if waves else None
+
+    @property
+    def collision_stats(self):
+        return self.broad_phase.stats
+
+    def spawn_x(self, max_x):
+        return self.rng.randint(0, max_x)
+
+    def spawn_obstacle(self):
+        self.add_obstacle(self.spawn_x(SCREEN_WIDTH - OBSTACLE_SIZE))
+
+    def add_obstacle(self, x):
+        self.obstacles.append(self.obstacle_pool.acquire(x, self.settings["obstacle_speed"], self.next_entity_id))
+        self.next_entity_id += 1
+
+    def spawn_bonus_circle(self):
+        x = self.spawn_x(SCREEN_WIDTH - 2 * BONUS_RADIUS)
+        self.bonus_circles.append(self.bonus_pool.acquire(x, self.settings["obstacle_speed"], self.next_entity_id))
+        self.next_entity_id += 1
+
+    # The *_positions methods take an interpolation factor between the previous
+    # tick (0.0) and the current one (1.0) so rendering can run between ticks
+
+    def player_position(self, alpha=1.0):
+        player = self.player
+        if alpha >= 1.0:
+            return player.x, player.y
+        return round(player.prev_x + (player.x - player.prev_x) * alpha), player.y
+
+    def obstacle_positions(self, alpha=1.0):
+        if alpha >= 1.0:
+            return [(obstacle.x, obstacle.y) for obstacle in self.obstacles]
+        back = 1.0 - alpha
+        return [(obstacle.x, round(obstacle.y - obstacle.speed * back)) for obstacle in self.obstacles]
+
+    def bonus_positions(self, alpha=1.0):
+        circles = [circle for circle in self.bonus_circles if not circle.collected]
+        if alpha >= 1.0:
+            return [(circle.x, circle.y) for circle in circles]
+        back = 1.0 - alpha
+        return [(circle.x, round(circle.y - circle.speed * back)) for circle in circles]
+
+    def tick(self, left=False, right=False):
+        """Apply one tick of player input and advance the simulation"""
+        if self.game_over:
+            return
+        self.player.prev_x = self.player.x
+        if left:
+            self.player.move("left")
+        if right:
+            self.player.move("right")
+        self.update()
+
+    def update(self):
+        if self.game_over:
+            return
+        self.broad_phase.stats.begin_tick()
+
+        # Spawn obstacles
+        self.spawn_counter += 1
+        if self.waves is not None:
+            # With waves the counter never resets and serves as the wave clock
+            for x in self.waves.spawns(self.spawn_counter):
+                self.add_obstacle(x)
+        elif self.spawn_counter >= self.settings["obstacle_spawn_rate"]:
+            self.spawn_obstacle()
+            self.spawn_counter = 0
+
+        # Spawn bonus circles (less frequently than obstacles)
+        self.bonus_spawn_counter += 1
+        if self.bonus_spawn_counter >= self.settings["bonus_spawn_rate"]:
+            self.spawn_bonus_circle()
+            self.bonus_spawn_counter = 0
+
+        self.update_obstacles()
+        self.update_bonus_circles()
+
+    def update_obstacles(self):
+        player = self.player
+        for obstacle in self.obstacles:
+            obstacle.move()
+
+        # Only obstacles sharing a grid cell with the player get a narrow-phase test
+        near = self.broad_phase.near(self.obstacles, player.x, player.y, player.size, player.size)
+        # Compact the list in place, handing removed obstacles back to the pool
+        obstacles = self.obstacles
+        kept = 0
+        for obstacle in obstacles:
+            if obstacle.is_off_screen():
+                self.obstacle_pool.release(obstacle)
+                self.score += 1
+                continue
+            if obstacle in near and obstacle.collides_with(player):
+                self.game_over = True
+                # Check for new high score
+                if self.score > self.high_score:
+                    self.high_score = self.score
+                    self.new_high_score = True
+            obstacles[kept] = obstacle
+            kept += 1
+        del obstacles[kept:]
+
+    def update_bonus_circles(self):
+        player = self.player
+        for circle in self.bonus_circles:
+            circle.move()
+
+        near = self.broad_phase.near(self.bonus_circles, player.x, player.y, player.size, player.size)
+        circles = self.bonus_circles
+        kept = 0
+        for circle in circles:
+            if circle.is_off_screen():
+                self.bonus_pool.release(circle)
+                continue
+            if circle in near and circle.collides_with(player):
+                circle.collected = True
+                self.score += 5  # Bonus points for collecting circles
+                self.bonus_pool.release(circle)
+                continue
+            circles[kept] = circle
+            kept += 1
+        del circles[kept:]
+
+    def release_entities(self):
+        self.obstacle_pool.release_all(self.obstacles)
+        self.bonus_pool.release_all(self.bonus_circles)
+        self.obstacles.clear()
+        self.bonus_circles.clear()
+
+    def entity_columns(self):
+        """(ids, xs, ys, speeds) int arrays for the live obstacles, then for the bonus circles"""
+        columns = []
+        for entities in (self.obstacles, self.bonus_circles):
+            columns.append((
+                array("i", [entity.id for entity in entities]),
+                array("i", [entity.x for entity in entities]),
+                array("i", [entity.y for entity in entities]),
+                array("i", [entity.speed for entity in entities]),
+            ))
+        return columns
+
+    def load_entity_columns(self, obstacles, bonus_circles):
+        """Make the live entities match `entity_columns` output"""
+        for (ids, xs, ys, speeds), pool, entities in ((obstacles, self.obstacle_pool, self.obstacles),
+                                                      (bonus_circles, self.bonus_pool, self.bonus_circles)):
+            # Only the difference in count goes through the pool; the entities
+            # already live are overwritten in place
+            count = len(ids)
+            while len(entities) > count:
+                pool.release(entities.pop())
+            while len(entities) < count:
+                entities.append(pool.acquire(0, 0))
+            for entity, entity_id, x, y, speed in zip(entities, ids, xs, ys, speeds):
+                entity.id = entity_id
+                entity.x = x
+                entity.y = y
+                entity.speed = speed
+
+    def reseed(self, seed=None):
+        """Draw every later spawn from `seed`, or from a fresh random seed if None"""
+        self.seed = new_seed() if seed is None else seed
+        self.rng.seed(self.seed)
+        if self.waves is not None:
+            self.waves = WaveScheduler(self.seed, self.settings)
+
+    def reset(self, seed=None):
+        self.reseed(seed)
+        self.player = Player()
+        self.release_entities()
+        self.score = 0
+        self.game_over = False
+        self.spawn_counter = 0
+        self.bonus_spawn_counter = 0
+        self.game_over_selection = 0
+        self.new_high_score = False
+        # Keep the same difficulty settings
@@ -0,0 +1,78 @@
+"""Pre-baked sprite atlas for the player, obstacles and bonus circles.
+
+Each entity visual is drawn once with the primitive ``draw_*`` functions into
+a single color-keyed atlas surface, so drawing an entity afterwards is one
+blit of an atlas region (batched through ``Surface.blits`` where available)
+instead of two or three ``pygame.draw`` calls.
+"""
+import pygame
+
+from .constants import BLUE, BONUS_RADIUS, OBSTACLE_SIZE, PLAYER_SIZE, RED, WHITE, YELLOW
+from .resources import registry
+
+# Atlas background, never used by any sprite
+COLORKEY = (255, 0, 255)
+
+
+def draw_player(surface, x, y):
+    pygame.draw.rect(surface, BLUE, (x, y, PLAYER_SIZE, PLAYER_SIZE))
+    # Small black box added to make it more 3D
+    pygame.draw.rect(surface, (100, 100, 255), (x + 2, y + 2, PLAYER_SIZE - 4, PLAYER_SIZE - 4))
+
+
+def draw_obstacle(surface, x, y):
+    pygame.draw.rect(surface, RED, (x, y, OBSTACLE_SIZE, OBSTACLE_SIZE))
+    pygame.draw.rect(surface, (200, 0, 0), (x + 2, y + 2, OBSTACLE_SIZE - 4, OBSTACLE_SIZE - 4))
+
+
+def draw_bonus_circle(surface, x, y):
+    center = (x + BONUS_RADIUS, y + BONUS_RADIUS)
+    # Draw outer circle
+    pygame.draw.circle(surface, YELLOW, center, BONUS_RADIUS)
+    # Draw inner circle for 3D effect
+    pygame.draw.circle(surface, (200, 200, 0), center, BONUS_RADIUS - 3)
+    # Draw sparkle effect
+    pygame.draw.circle(surface, WHITE, center, 3)
+
+
+class SpriteAtlas:
+    def __init__(self):
+        sizes = {
+            "player": (PLAYER_SIZE, PLAYER_SIZE),
+            "obstacle": (OBSTACLE_SIZE, OBSTACLE_SIZE),
+            "bonus": (2 * BONUS_RADIUS, 2 * BONUS_RADIUS),
+        }
+        width = sum(w for w, _ in sizes.values())
+        height = max(h for _, h in sizes.values())
+        self.surface = pygame.Surface((width, height))
+        self.surface.fill(COLORKEY)
+
+        # Lay the sprites out left to right and bake each one
+        self.regions = {}
+        painters = {"player": draw_player, "obstacle": draw_obstacle, "bonus": draw_bonus_circle}
+        x = 0
+        for name, (w, h) in sizes.items():
+            self.regions[name] = pygame.Rect(x, 0, w, h)
+            painters[name](self.surface, x, 0)
+            x += w
+
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        self.surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+
+    def blit(self, target, name, position):
+        target.blit(self.surface, position, self.regions[name])
+
+    def blit_many(self, target, name, positions):
+        atlas = self.surface
+        area = self.regions[name]
+        if hasattr(target, "blits"):
+            target.blits([(atlas, position, area) for position in positions], doreturn=False)
+        else:
+            for position in positions:
+                target.blit(atlas, position, area)
+
+
+def get_atlas():
+    """Return the shared atlas, baking it on first use"""
+    return registry.get("sprite_atlas", SpriteAtlas)
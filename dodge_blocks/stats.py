@@ -0,0 +1,12 @@
+"""Small statistics helpers shared by the game, the batch tools and the benchmarks."""
+import math
+
+
+def percentile(sorted_values, p):
+    """Linearly interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lo = math.floor(k)
+    hi = math.ceil(k)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
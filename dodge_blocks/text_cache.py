@@ -0,0 +1,61 @@
+"""Shared cache of rendered text surfaces.
+
+Almost every string on screen is identical from one frame to the next, so
+rendering goes through ``render_text``, which only asks the font to rasterize
+when a (face, size, text, color, antialias) combination has not been seen
+recently. Least recently used surfaces are evicted once the cache is full.
+"""
+from collections import OrderedDict
+
+from .resources import get_font
+
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, face, size, text, color, antialias=True):
+        key = (face, size, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = get_font(face, size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.surfaces),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+shared_cache = TextCache()
+
+
+def render_text(face, size, text, color, antialias=True):
+    """Render text through the shared cache"""
+    return shared_cache.render(face, size, text, color, antialias)
@@ -0,0 +1,56 @@
+"""Fixed-timestep scheduling, decoupled from the render rate.
+
+The frontend feeds real elapsed time into ``FixedTimestep.advance`` every
+frame and runs as many simulation ticks as it returns. Leftover time stays in
+the accumulator and ``alpha`` tells the renderer how far between the last two
+ticks to interpolate. A frame that took too long runs at most
+``max_substeps`` ticks; the rest of the backlog is dropped so one slow frame
+can't snowball into a death spiral.
+"""
+import time
+
+
+class FixedTimestep:
+    def __init__(self, tick_rate=60, max_substeps=5):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped_ticks = 0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, frame_time):
+        """Add `frame_time` seconds of real time and return how many ticks are due"""
+        self.accumulator += frame_time
+        due = int(self.accumulator / self.dt)
+        if due > self.max_substeps:
+            self.dropped_ticks += due - self.max_substeps
+            due = self.max_substeps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= due * self.dt
+        self.ticks += due
+        return due
+
+    @property
+    def alpha(self):
+        """How far the render time is between the last tick (0.0) and the next (1.0)"""
+        return min(1.0, self.accumulator / self.dt)
+
+
+def fast_forward(game, max_ticks, policy):
+    """Run `game` uncapped with no rendering until it ends or `max_ticks` pass.
+
+    `policy(game)` returns the (left, right) input for each tick. Returns the
+    number of ticks simulated and the wall time it took.
+    """
+    start = time.perf_counter()
+    ticks = 0
+    while ticks < max_ticks and not game.game_over:
+        left, right = policy(game)
+        game.tick(left, right)
+        ticks += 1
+    return ticks, time.perf_counter() - start
@@ -0,0 +1,193 @@
+"""Batched environments for training and evaluating bots.
+
+``VecEnv`` steps K independent games at once with the same rules as
+``Game``: spawn timers, player movement, swept obstacle and bonus collisions
+and scoring. Per-env state lives in NumPy arrays of shape (K,) or (K, slots),
+so a step is a handful of array operations regardless of K::
+
+    env = VecEnv(1024, "Pro", seed=0)
+    obs = env.reset()
+    while training:
+        obs, rewards, dones = env.step(actions)  # actions: 0 stay, 1 left, 2 right
+
+Finished games are reset automatically inside ``step``; their final score and
+length are left in ``final_scores``/``final_ticks``. Each game draws spawn
+positions from its own ``random.Random`` seeded like ``Game``, so any episode
+can be re-simulated exactly with ``Game(difficulty, seed=env.seeds[i])``.
+"""
+import math
+import random
+
+import numpy as np
+
+from .constants import (
+    BONUS_RADIUS,
+    DIFFICULTY_SETTINGS,
+    OBSTACLE_SIZE,
+    PLAYER_SIZE,
+    PLAYER_SPEED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+
+STAY = 0
+LEFT = 1
+RIGHT = 2
+
+PLAYER_START_X = SCREEN_WIDTH // 2
+PLAYER_Y = SCREEN_HEIGHT - 50
+
+
+def slots_needed(speed, spawn_rate, height):
+    """Most entities of one kind that can be on screen at once"""
+    ticks_alive = math.ceil((SCREEN_HEIGHT + height) / speed) + 1
+    return math.ceil(ticks_alive / spawn_rate) + 1
+
+
+class VecEnv:
+    def __init__(self, num_envs, difficulty="Intermediate", seed=0, settings=None,
+                 nearest_obstacles=3, nearest_bonus=1):
+        self.num_envs = num_envs
+        self.difficulty = difficulty
+        self.settings = settings if settings is not None else DIFFICULTY_SETTINGS[difficulty]
+        self.nearest_obstacles = nearest_obstacles
+        self.nearest_bonus = nearest_bonus
+        self.seed_source = np.random.default_rng(seed)
+
+        speed = self.settings["obstacle_speed"]
+        k = num_envs
+        m = slots_needed(speed, self.settings["obstacle_spawn_rate"], OBSTACLE_SIZE)
+        b = slots_needed(speed, self.settings["bonus_spawn_rate"], 2 * BONUS_RADIUS)
+        self.player_x = np.full(k, PLAYER_START_X, dtype=np.int32)
+        self.obstacle_x = np.zeros((k, m), dtype=np.int32)
+        self.obstacle_y = np.zeros((k, m), dtype=np.int32)
+        self.obstacle_alive = np.zeros((k, m), dtype=bool)
+        self.bonus_x = np.zeros((k, b), dtype=np.int32)
+        self.bonus_y = np.zeros((k, b), dtype=np.int32)
+        self.bonus_alive = np.zeros((k, b), dtype=bool)
+        self.spawn_counter = np.zeros(k, dtype=np.int32)
+        self.bonus_spawn_counter = np.zeros(k, dtype=np.int32)
+        self.score = np.zeros(k, dtype=np.int64)
+        self.ticks = np.zeros(k, dtype=np.int64)
+        self.final_scores = np.zeros(k, dtype=np.int64)
+        self.final_ticks = np.zeros(k, dtype=np.int64)
+        self.episodes = 0
+        self.seeds = [0] * k
+        self.rngs = [random.Random() for _ in range(k)]
+        self.all_envs = np.arange(k)
+
+    @property
+    def observation_size(self):
+        return 1 + 3 * (self.nearest_obstacles + self.nearest_bonus)
+
+    def reset(self):
+        self.reset_envs(self.all_envs)
+        return self.observe()
+
+    def reset_envs(self, envs):
+        for env in envs.tolist():
+            seed = int(self.seed_source.integers(2**63))
+            self.seeds[env] = seed
+            self.rngs[env].seed(seed)
+        self.player_x[envs] = PLAYER_START_X
+        self.obstacle_alive[envs] = False
+        self.bonus_alive[envs] = False
+        self.spawn_counter[envs] = 0
+        self.bonus_spawn_counter[envs] = 0
+        self.score[envs] = 0
+        self.ticks[envs] = 0
+
+    def spawn(self, envs, xs, ys, alive, start_y, max_x):
+        if not len(envs):
+            return
+        if alive[envs].all(axis=1).any():
+            raise RuntimeError("entity slots exhausted; settings spawn faster than slots_needed allows")
+        slots = np.argmin(alive[envs], axis=1)  # first free slot
+        rngs = self.rngs
+        xs[envs, slots] = [rngs[env].randint(0, max_x) for env in envs.tolist()]
+        ys[envs, slots] = start_y
+        alive[envs, slots] = True
+
+    def step(self, actions):
+        """Advance every game one tick; returns (observations, rewards, dones)"""
+        actions = np.asarray(actions)
+        settings = self.settings
+        speed = settings["obstacle_speed"]
+        score_before = self.score.copy()
+
+        # Player movement, as Player.move
+        x = self.player_x
+        x -= np.where((actions == LEFT) & (x > 0), PLAYER_SPEED, 0).astype(np.int32)
+        x += np.where((actions == RIGHT) & (x < SCREEN_WIDTH - PLAYER_SIZE), PLAYER_SPEED, 0).astype(np.int32)
+
+        # Spawn timers; obstacles draw from each game's generator before bonuses
+        self.spawn_counter += 1
+        due = np.flatnonzero(self.spawn_counter >= settings["obstacle_spawn_rate"])
+        self.spawn(due, self.obstacle_x, self.obstacle_y, self.obstacle_alive,
+                   -OBSTACLE_SIZE, SCREEN_WIDTH - OBSTACLE_SIZE)
+        self.spawn_counter[due] = 0
+        self.bonus_spawn_counter += 1
+        due = np.flatnonzero(self.bonus_spawn_counter >= settings["bonus_spawn_rate"])
+        self.spawn(due, self.bonus_x, self.bonus_y, self.bonus_alive,
+                   -2 * BONUS_RADIUS, SCREEN_WIDTH - 2 * BONUS_RADIUS)
+        self.bonus_spawn_counter[due] = 0
+
+        px = x[:, None]
+
+        # Obstacles: fall, score the ones that left the screen, sweep the rest
+        alive = self.obstacle_alive
+        self.obstacle_y += speed
+        oy = self.obstacle_y
+        ox = self.obstacle_x
+        off = alive & (oy > SCREEN_HEIGHT)
+        hit = (alive & ~off &
+               (ox < px + PLAYER_SIZE) & (ox + OBSTACLE_SIZE > px) &
+               (oy - speed < PLAYER_Y + PLAYER_SIZE) & (oy + OBSTACLE_SIZE > PLAYER_Y))
+        self.score += off.sum(axis=1)
+        alive &= ~off
+        dones = hit.any(axis=1)
+
+        # Bonus circles: the gap between each center's fall and the player box
+        alive = self.bonus_alive
+        self.bonus_y += speed
+        by = self.bonus_y
+        off = alive & (by > SCREEN_HEIGHT)
+        center_x = self.bonus_x + BONUS_RADIUS
+        gap_x = np.maximum(np.maximum(px - center_x, center_x - (px + PLAYER_SIZE)), 0)
+        gap_y = np.maximum(np.maximum(PLAYER_Y - (by + BONUS_RADIUS),
+                                      by - speed + BONUS_RADIUS - (PLAYER_Y + PLAYER_SIZE)), 0)
+        collected = alive & ~off & (gap_x * gap_x + gap_y * gap_y < BONUS_RADIUS * BONUS_RADIUS)
+        self.score += 5 * collected.sum(axis=1)
+        alive &= ~(off | collected)
+
+        self.ticks += 1
+        rewards = (self.score - score_before).astype(np.float32)
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            self.final_scores[finished] = self.score[finished]
+            self.final_ticks[finished] = self.ticks[finished]
+            self.episodes += len(finished)
+            self.reset_envs(finished)
+        return self.observe(), rewards, dones
+
+    def nearest(self, xs, ys, alive, count):
+        """(x, y, present) of the `count` lowest live entities per game, lowest first"""
+        k = self.num_envs
+        out = np.zeros((k, count, 3), dtype=np.float32)
+        # Lower on screen means closer to the player
+        order = np.argsort(np.where(alive, -ys, np.iinfo(np.int32).max), axis=1)[:, :count]
+        rows = self.all_envs[:, None]
+        n = order.shape[1]
+        out[:, :n, 0] = xs[rows, order]
+        out[:, :n, 1] = ys[rows, order]
+        out[:, :n, 2] = alive[rows, order]
+        out[:, :n, :2] *= out[:, :n, 2:]
+        return out.reshape(k, -1)
+
+    def observe(self):
+        """Per game: player x, then (x, y, present) for the nearest obstacles and bonus circles"""
+        return np.concatenate([
+            self.player_x[:, None].astype(np.float32),
+            self.nearest(self.obstacle_x, self.obstacle_y, self.obstacle_alive, self.nearest_obstacles),
+            self.nearest(self.bonus_x, self.bonus_y, self.bonus_alive, self.nearest_bonus),
+        ], axis=1)
@@ -0,0 +1,245 @@
+"""Wave-pattern obstacle spawning with a reachability check.
+
+Instead of one obstacle every ``obstacle_spawn_rate`` ticks at a random x,
+``WaveScheduler`` plays a lazy stream of waves: scattered drops, walls with
+a gap, zigzag corridors and dense streams, all scaled to the difficulty's
+spawn rate. Waves are generated a little ahead of the tick that needs them,
+and each candidate is checked before it is accepted.
+
+The check is dynamic programming over a time-by-column grid. The player's x
+is always a multiple of ``PLAYER_SPEED`` between 0 and
+``SCREEN_WIDTH - PLAYER_SIZE``, so there are 155 columns and the player moves
+at most one column per tick. The columns still reachable without being hit
+at a tick form an int bitset, and one tick of the DP is
+``(reach | reach << 1 | reach >> 1) & ~blocked[tick]``. Each obstacle blocks
+a fixed range of columns for the few ticks its swept box crosses the
+player's row, worked out in closed form with the same overlap test as
+``Game``. A candidate whose obstacles would leave no reachable column is
+rejected and another is drawn. After a few rejections an empty rest wave is
+used, which always passes.
+
+The stream depends only on the game's seed, not on the player. It can
+therefore be re-read after a rewind, and a replay spawns the same waves.
+Spawns are kept only back to ``rewind_horizon``, the wave clock of the
+oldest state a rewind can return to (``dodge_blocks.rewind`` keeps it up to
+date), or just to the current tick when nothing rewinds. Asking for a tick
+older than that rebuilds the stream from the seed, which is how a restart
+from the first tick gets its waves back.
+"""
+import random
+
+from .constants import OBSTACLE_SIZE, PLAYER_SIZE, PLAYER_SPEED, SCREEN_HEIGHT, SCREEN_WIDTH
+
+COLUMNS = (SCREEN_WIDTH - PLAYER_SIZE) // PLAYER_SPEED + 1
+ALL_COLUMNS = (1 << COLUMNS) - 1
+START_COLUMN = (SCREEN_WIDTH // 2) // PLAYER_SPEED
+PLAYER_Y = SCREEN_HEIGHT - 50
+MAX_X = SCREEN_WIDTH - OBSTACLE_SIZE
+
+# Keeps the wave stream independent of the game's own spawn generator
+WAVE_SEED_SALT = 0x5EED_3A7E
+LOOKAHEAD_TICKS = 60
+MAX_ATTEMPTS = 8
+
+
+def column_mask(x):
+    """Player columns an obstacle at `x` overlaps"""
+    lo = max(0, (x - PLAYER_SIZE) // PLAYER_SPEED + 1)
+    hi = min(COLUMNS - 1, (x + OBSTACLE_SIZE - 1) // PLAYER_SPEED)
+    return ((1 << (hi - lo + 1)) - 1) << lo
+
+
+COLUMN_MASKS = [column_mask(x) for x in range(MAX_X + 1)]
+
+
+def hit_ticks(speed):
+    """Ticks after spawning (the spawn tick is 0) during which an obstacle can hit the player"""
+    ticks = []
+    age = 0
+    while True:
+        # Spawned at -OBSTACLE_SIZE and moved once in the tick it spawns
+        y = -OBSTACLE_SIZE + speed * (age + 1)
+        if y > SCREEN_HEIGHT:
+            return ticks
+        if y - speed < PLAYER_Y + PLAYER_SIZE and y + OBSTACLE_SIZE > PLAYER_Y:
+            ticks.append(age)
+        age += 1
+
+
+def advance(reach, blocked, start, end):
+    """Reachable columns at tick `end` from `reach` at `start`; 0 as soon as none survive"""
+    for tick in range(start + 1, end + 1):
+        reach = (reach | reach << 1 | reach >> 1) & ALL_COLUMNS & ~blocked.get(tick, 0)
+        if not reach:
+            return 0
+    return reach
+
+
+class ReachabilityVerifier:
+    def __init__(self, speed, start_column=START_COLUMN):
+        self.hit_ticks = hit_ticks(speed)
+        self.blocked = {}  # tick -> columns where standing gets the player hit
+        # Columns reachable at `tick`; nothing accepted later can block a tick before it
+        self.tick = 0
+        self.reach = 1 << start_column
+        self.checked = 0
+
+    def masks(self, obstacles):
+        """Blocked columns per tick added by (spawn tick, x) obstacles"""
+        masks = {}
+        for spawn_tick, x in obstacles:
+            mask = COLUMN_MASKS[x]
+            for age in self.hit_ticks:
+                tick = spawn_tick + age
+                masks[tick] = masks.get(tick, 0) | mask
+        return masks
+
+    def check(self, obstacles):
+        """Whether the player can still survive every tick these obstacles could hit"""
+        self.checked += 1
+        masks = self.masks(obstacles)
+        if not masks:
+            return True
+        # Only unsettled ticks are kept, so this copy stays a wave or two long
+        blocked = dict(self.blocked)
+        for tick, mask in masks.items():
+            blocked[tick] = blocked.get(tick, 0) | mask
+        return advance(self.reach, blocked, self.tick, max(blocked)) != 0
+
+    def accept(self, obstacles, final_tick):
+        """Add accepted obstacles, then settle the DP up to `final_tick`, which no later wave can affect"""
+        blocked = self.blocked
+        for tick, mask in self.masks(obstacles).items():
+            blocked[tick] = blocked.get(tick, 0) | mask
+        if final_tick > self.tick:
+            self.reach = advance(self.reach, blocked, self.tick, final_tick)
+            for tick in range(self.tick + 1, final_tick + 1):
+                blocked.pop(tick, None)
+            self.tick = final_tick
+
+
+class Wave:
+    __slots__ = ("name", "length", "spawns")
+
+    def __init__(self, name, length, spawns):
+        self.name = name
+        self.length = length
+        self.spawns = spawns  # (tick offset, x) pairs
+
+
+def gap_row(gap_x, gap_width):
+    """Obstacle xs covering the screen except [gap_x, gap_x + gap_width)"""
+    xs = []
+    x = 0
+    while x <= MAX_X:
+        if x + OBSTACLE_SIZE <= gap_x or x >= gap_x + gap_width:
+            xs.append(x)
+            x += OBSTACLE_SIZE
+        else:
+            x = gap_x + gap_width
+    return xs
+
+
+def scatter(rng, rate):
+    # The classic pattern: one drop per spawn interval
+    count = rng.randint(3, 6)
+    return Wave("scatter", count * rate, [(i * rate, rng.randint(0, MAX_X)) for i in range(count)])
+
+
+def wall(rng, rate):
+    gap_width = rng.randint(2 * PLAYER_SIZE, 4 * PLAYER_SIZE)
+    gap_x = rng.randint(0, SCREEN_WIDTH - gap_width)
+    return Wave("wall", 2 * rate, [(0, x) for x in gap_row(gap_x, gap_width)])
+
+
+def zigzag(rng, rate):
+    rows = rng.randint(3, 5)
+    spacing = max(8, rate // 3)
+    gap_width = rng.randint(2 * PLAYER_SIZE, 3 * PLAYER_SIZE)
+    gap_x = rng.randint(0, SCREEN_WIDTH - gap_width)
+    spawns = []
+    for row in range(rows):
+        spawns += [(row * spacing, x) for x in gap_row(gap_x, gap_width)]
+        # Moving the gap further than the player can follow gets the wave rejected
+        gap_x = min(SCREEN_WIDTH - gap_width, max(0, gap_x + rng.randint(-160, 160)))
+    return Wave("zigzag", rows * spacing + rate, spawns)
+
+
+def stream(rng, rate):
+    count = rng.randint(4, 10)
+    spacing = max(4, rate // 4)
+    return Wave("stream", count * spacing + rate, [(i * spacing, rng.randint(0, MAX_X)) for i in range(count)])
+
+
+PATTERNS = [(scatter, 4), (wall, 2), (zigzag, 2), (stream, 2)]
+
+
+def make_wave(rng, rate):
+    pattern = rng.choices([pattern for pattern, _ in PATTERNS], [weight for _, weight in PATTERNS])[0]
+    return pattern(rng, rate)
+
+
+class WaveScheduler:
+    def __init__(self, seed, settings, lookahead=LOOKAHEAD_TICKS, max_attempts=MAX_ATTEMPTS):
+        self.seed = seed
+        self.settings = settings
+        self.rate = settings["obstacle_spawn_rate"]
+        self.lookahead = lookahead
+        self.max_attempts = max_attempts
+        # Oldest wave clock a rewind can return to; None when nothing rewinds
+        self.rewind_horizon = None
+        self.reset()
+
+    def reset(self):
+        """Start the stream over from its first tick"""
+        self.rng = random.Random(self.seed ^ WAVE_SEED_SALT)
+        self.verifier = ReachabilityVerifier(self.settings["obstacle_speed"])
+        self.events = {}  # tick -> xs spawning then; kept back to the rewind horizon
+        self.kept_from = 1  # spawns before this tick have been dropped
+        self.next_start = 1
+        self.waves = 0
+        self.rejected = 0
+        self.rests = 0
+
+    def generate(self):
+        """Append the next wave that passes the verifier"""
+        start = self.next_start
+        for _ in range(self.max_attempts):
+            wave = make_wave(self.rng, self.rate)
+            obstacles = [(start + offset, x) for offset, x in wave.spawns]
+            if self.verifier.check(obstacles):
+                break
+            self.rejected += 1
+        else:
+            wave = Wave("rest", self.rate, [])
+            obstacles = []
+            self.rests += 1
+
+        self.next_start = start + wave.length
+        # Later waves spawn at next_start or after, and can't hit before their first hit tick
+        self.verifier.accept(obstacles, self.next_start + self.verifier.hit_ticks[0] - 1)
+        for tick, x in obstacles:
+            self.events.setdefault(tick, []).append(x)
+        self.waves += 1
+
+    def spawns(self, tick):
+        """Obstacle xs spawning at `tick` (counted from 1), generating further ahead as needed"""
+        if tick < self.kept_from:
+            # Gone back past what was kept; the stream only depends on the seed
+            self.reset()
+        while self.next_start <= tick + self.lookahead:
+            self.generate()
+        xs = self.events.get(tick, ())
+        keep_from = tick if self.rewind_horizon is None else min(tick, self.rewind_horizon + 1)
+        for old in range(self.kept_from, keep_from):
+            self.events.pop(old, None)
+        self.kept_from = max(self.kept_from, keep_from)
+        return xs
+
+    def stats(self):
+        return {
+            "waves": self.waves,
+            "rejected": self.rejected,
+            "rests": self.rests,
+            "checked": self.verifier.checked,
+        }